@@ -3,20 +3,32 @@ Real Estate Management Telegram Bot
 A fully interactive chatbot with goal-first approach, voice support, and stateful memory.
 All messages and code comments are in English.
 """
+import asyncio
+import functools
+import io
 import logging
-import os
+import re
+import time
+import weakref
+from collections import OrderedDict, deque
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.constants import ChatAction
 from telegram.ext import (
     Application,
     CommandHandler,
     MessageHandler,
     CallbackQueryHandler,
     ContextTypes,
-    filters
+    filters,
+    PersistenceInput,
+    PicklePersistence
 )
+from telegram.request import HTTPXRequest
 from database import DatabaseManager
 from gpt_handler import GptHandler
+from openai_session import close_session
 from voice_handler import VoiceHandler
+from utils import truncate_text
 import config
 
 # Configure logging
@@ -36,11 +48,568 @@ STATE_EDIT_SELECTION = 'edit_selecting'
 STATE_EDIT = 'editing'
 STATE_CONFIRM = 'confirming'
 
+# Key of the UserSession inside context.user_data
+SESSION_KEY = 'session'
+
+# Recently viewed properties kept per user, so view -> delete -> cancel (view again)
+# does not hit the database twice; short-lived because other users may edit them
+PROPERTY_CACHE_SIZE = 16
+PROPERTY_CACHE_TTL = 60.0
+
+
+class UserSession:
+    """
+    Per-user conversation state, kept in context.user_data under SESSION_KEY
+    Handlers read these fields on every update, so they are plain slot attributes
+    instead of separate user_data keys
+    """
+    
+    __slots__ = (
+        'state', 'goal', 'partial_data', 'conversation_history', 'editing_property_id',
+        'available_edit_property_ids', 'latest_edit_filters', 'property_listing', 'property_cache'
+    )
+    
+    def __init__(self):
+        self.state = STATE_WAITING_FOR_GOAL
+        self.goal = None
+        # Accumulated property data / search filters for the current goal
+        self.partial_data = {}
+        # Recent conversation for context (oldest turns are dropped automatically)
+        self.conversation_history = deque(maxlen=config.CONVERSATION_HISTORY_LIMIT)
+        self.editing_property_id = None
+        self.available_edit_property_ids = None
+        self.latest_edit_filters = None
+        # Current paginated listing (see RealEstateBot._send_property_listing)
+        self.property_listing = None
+        # Property ID -> (expiry time, owner user ID, formatted text), oldest first
+        self.property_cache = OrderedDict()
+    
+    def __getstate__(self):
+        # The property cache is not persisted; it is only valid for a short time anyway
+        return {name: getattr(self, name) for name in self.__slots__ if name != 'property_cache'}
+    
+    def __setstate__(self, state):
+        self.__init__()
+        for name, value in state.items():
+            setattr(self, name, value)
+    
+    def get_cached_property(self, property_id: int):
+        """Return (owner user ID, formatted text) cached for property_id, or None if missing or expired"""
+        entry = self.property_cache.get(property_id)
+        if entry is None:
+            return None
+        
+        expires_at, owner_id, text = entry
+        if expires_at < time.monotonic():
+            del self.property_cache[property_id]
+            return None
+        return owner_id, text
+    
+    def cache_property(self, prop) -> str:
+        """
+        Render a Property fetched from the database and remember the result,
+        evicting the oldest entry when full
+        
+        Returns:
+            The formatted property text
+        """
+        text = prop.to_text()
+        self.property_cache[prop.id] = (time.monotonic() + PROPERTY_CACHE_TTL, prop.user_id, text)
+        self.property_cache.move_to_end(prop.id)
+        if len(self.property_cache) > PROPERTY_CACHE_SIZE:
+            self.property_cache.popitem(last=False)
+        return text
+    
+    def forget_property(self, property_id: int):
+        """Drop a property from the cache (after it was deleted)"""
+        self.property_cache.pop(property_id, None)
+
+
+def _get_session(context) -> UserSession:
+    """Get the user's session, creating it on first use"""
+    session = context.user_data.get(SESSION_KEY)
+    if session is None:
+        session = context.user_data[SESSION_KEY] = UserSession()
+    return session
+
+
+def _reset_session(context) -> UserSession:
+    """Drop all stored user data and start a fresh session waiting for a goal"""
+    context.user_data.clear()
+    session = context.user_data[SESSION_KEY] = UserSession()
+    return session
+
+# Keywords that select a goal when typed as free text, in priority order
+GOAL_KEYWORDS = (
+    ('register', ('register', 'add', 'create', 'new property', 'list property', 'post')),
+    ('search', ('search', 'find', 'look for', 'looking for', 'want to find')),
+    ('filter', ('filter', 'keyword', 'contains')),
+    ('edit', ('edit', 'update', 'modify', 'change')),
+    ('list', ('list', 'show my', 'my properties', 'view my')),
+)
+
+# Phrases that ask for the full property list while choosing a property to edit
+SHOW_ALL_PHRASES = (
+    'show all properties',
+    'show all',
+    'list all properties',
+    'see all properties',
+    'display all properties',
+)
+
+# Goal -> priority (index into GOAL_KEYWORDS)
+_GOAL_RANKS = {goal: rank for rank, (goal, _) in enumerate(GOAL_KEYWORDS)}
+
+# All goal keywords compiled into one pattern, scanned in a single pass, with one
+# named group per goal so match.lastgroup names the goal directly.
+# The lookahead reports a match at every position, so overlapping keywords
+# are still seen; groups are ordered by priority, keywords by length.
+_GOAL_KEYWORDS_RE = re.compile('(?=(?:{}))'.format('|'.join(
+    '(?P<{}>{})'.format(goal, '|'.join(
+        re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)
+    ))
+    for goal, keywords in GOAL_KEYWORDS
+)))
+
+
+def _match_goal(lower_text: str):
+    """
+    Scan lowercased text for goal keywords
+    
+    Args:
+        lower_text: Lowercased user input
+    
+    Returns:
+        Goal of the highest-priority keyword found, or None
+    """
+    # One scan finds every keyword; the highest-priority goal wins
+    # (stopping early once the top-priority goal is seen)
+    best_rank = None
+    for match in _GOAL_KEYWORDS_RE.finditer(lower_text):
+        rank = _GOAL_RANKS[match.lastgroup]
+        if best_rank is None or rank < best_rank:
+            best_rank = rank
+            if rank == 0:
+                break
+    
+    if best_rank is None:
+        return None
+    return GOAL_KEYWORDS[best_rank][0]
+
+
+# Messages that consist of just one keyword (e.g. "search") resolved ahead of time
+_GOAL_EXACT = {
+    keyword: _match_goal(keyword)
+    for _, keywords in GOAL_KEYWORDS
+    for keyword in keywords
+}
+
+_SHOW_ALL_RE = re.compile('|'.join(re.escape(phrase) for phrase in SHOW_ALL_PHRASES))
+
+# Phrases that clear a field while editing ("delete the description", "no parking", ...)
+DELETION_KEYWORDS = ('delete', 'remove', 'clear', 'erase', 'drop')
+RESET_KEYWORDS = ('set', 'make')
+NEGATIVE_KEYWORDS = ('no', 'without')
+
+FIELD_SYNONYMS = {
+    'description': ('description', 'details', 'summary', 'notes', 'note'),
+    'address': ('address', 'location details'),
+    'neighborhood': ('neighborhood', 'district', 'area name'),
+    'title': ('title', 'headline'),
+    'parking': ('parking', 'garage', 'car park'),
+    'elevator': ('elevator', 'lift'),
+    'storage': ('storage', 'storage room', 'locker', 'pantry')
+}
+BOOLEAN_FIELDS = frozenset({'parking', 'elevator', 'storage'})
+
+
+def _build_field_deletion_phrases():
+    """
+    Expand the keyword tables into every phrase that clears a field
+    
+    Returns:
+        Tuple of (field, cleared value, phrases) entries; booleans clear to False,
+        other fields to None
+    """
+    entries = []
+    
+    for field, synonyms in FIELD_SYNONYMS.items():
+        phrases = []
+        for synonym in synonyms:
+            # Direct deletion commands (delete/remove/clear ...)
+            for keyword in DELETION_KEYWORDS:
+                phrases += [
+                    f"{keyword} {synonym}",
+                    f"{keyword} the {synonym}",
+                    f"{keyword} this {synonym}",
+                    f"{keyword} that {synonym}",
+                    f"{keyword} my {synonym}",
+                    f"{keyword} the {synonym} field"
+                ]
+            
+            # Reset commands (set description to none/null/empty)
+            for keyword in RESET_KEYWORDS:
+                phrases += [
+                    f"{keyword} {synonym} to none",
+                    f"{keyword} {synonym} to null",
+                    f"{keyword} {synonym} to empty",
+                    f"{keyword} {synonym} to blank",
+                    f"{keyword} the {synonym} to none",
+                    f"{keyword} the {synonym} to null"
+                ]
+            
+            # Negative phrases for booleans (no parking / without elevator)
+            if field in BOOLEAN_FIELDS:
+                phrases += [
+                    f"{NEGATIVE_KEYWORDS[0]} {synonym}",
+                    f"{NEGATIVE_KEYWORDS[1]} {synonym}",
+                    f"there is {NEGATIVE_KEYWORDS[0]} {synonym}",
+                    f"{synonym} is not needed",
+                    f"{synonym} not needed"
+                ]
+        
+        value = False if field in BOOLEAN_FIELDS else None
+        entries.append((field, value, tuple(dict.fromkeys(phrases))))
+    
+    return tuple(entries)
+
+
+FIELD_DELETION_PHRASES = _build_field_deletion_phrases()
+FIELD_CLEARED_VALUES = {field: value for field, value, _ in FIELD_DELETION_PHRASES}
+
+# All phrases in one pattern with a named group per field. The lookahead lets
+# finditer test every position, so overlapping phrases are all seen. No phrase
+# of one field is a prefix of another field's phrase, so the group that matches
+# at a position is the only field that could match there.
+FIELD_DELETION_RE = re.compile('(?=(?:{}))'.format('|'.join(
+    '(?P<{}>{})'.format(field, '|'.join(
+        re.escape(phrase) for phrase in sorted(phrases, key=len, reverse=True)
+    ))
+    for field, _, phrases in FIELD_DELETION_PHRASES
+)))
+
+# Every deletion phrase contains one of these, so a message without any of them
+# cannot clear a field and the full phrase scan can be skipped
+_DELETION_PREFILTER_RE = re.compile('|'.join(
+    [re.escape(keyword + ' ') for keyword in DELETION_KEYWORDS + RESET_KEYWORDS + NEGATIVE_KEYWORDS]
+    + ['not needed']
+))
+
+# Furthest a prefilter hit can sit from the start of its phrase ("storage room is not needed").
+# No phrase can start earlier than this before the first hit, so the scan starts there.
+_DELETION_MAX_TRIGGER_OFFSET = max(
+    _DELETION_PREFILTER_RE.search(phrase).start()
+    for _, _, phrases in FIELD_DELETION_PHRASES
+    for phrase in phrases
+)
+
+# Whitespace runs, collapsed to one space before phrase matching
+_WS_RE = re.compile(r'\s+')
+
+# Labels for the property summary, in display order
+_FIELD_LABELS = (
+    ('title', '🏠 Title'),
+    ('property_type', '🏢 Type'),
+    ('city', '🌆 City'),
+    ('neighborhood', '📍 Neighborhood'),
+    ('address', '📮 Address'),
+    ('area', '📐 Area'),
+    ('price', '💰 Price'),
+    ('rooms', '🛏 Bedrooms'),
+    ('floor', '🏗 Floor'),
+    ('year_built', '📅 Year Built'),
+    ('parking', '🅿️ Parking'),
+    ('elevator', '🛗 Elevator'),
+    ('storage', '📦 Storage'),
+    ('description', '📝 Description')
+)
+
+_FIELD_LABEL_MAP = dict(_FIELD_LABELS)
+_FIELD_ORDER = {key: index for index, (key, _) in enumerate(_FIELD_LABELS)}
+
+
+def _format_money(value) -> str:
+    """Format a price/area number with thousands separators"""
+    if isinstance(value, (int, float)):
+        return f"{value:,.2f}"
+    return str(value)
+
+
+def _format_yes_no(value) -> str:
+    """Format an amenity flag as Yes/No"""
+    if isinstance(value, bool):
+        return 'Yes' if value else 'No'
+    return str(value)
+
+
+# Summary formatters for fields that are not shown as plain text
+_FIELD_FORMATTERS = {
+    'price': _format_money,
+    'area': _format_money,
+    'parking': _format_yes_no,
+    'elevator': _format_yes_no,
+    'storage': _format_yes_no
+}
+
+# Names used when asking the user for missing required fields
+_FIELD_NAMES = {
+    'title': 'Property title',
+    'property_type': 'Property type (apartment, house, etc.)',
+    'city': 'City',
+    'neighborhood': 'Neighborhood',
+    'area': 'Size/Area',
+    'price': 'Price',
+    'rooms': 'Number of bedrooms'
+}
+
+# Values that mean a field has not been filled in
+_EMPTY_SENTINELS = frozenset((None, '', 'null'))
+
+# Replies accepted while confirming a registration
+_CONFIRM_WORDS = frozenset({'confirm', 'yes', 'submit', 'ok', 'correct', 'save'})
+_CANCEL_WORDS = frozenset({'cancel', 'no', 'abort', 'stop'})
+_WORD_RE = re.compile(r'\w+')
+
+# Static messages that are sent trimmed, prepared once instead of per send
+_EDIT_ALL_LISTED_TEXT = config.MESSAGES['edit_all_listed'].strip()
+_EDIT_NEED_FILTERS_TEXT = config.MESSAGES['edit_need_filters'].strip()
+_EDIT_NO_MATCHES_TEXT = config.MESSAGES['edit_no_matches'].strip()
+
+# Bound formatters for the templated messages sent on every registration/search turn
+_FORMAT_VOICE_RECOGNIZED = config.MESSAGES['voice_recognized'].format
+_FORMAT_MISSING_INFO = config.MESSAGES['missing_info'].format
+_FORMAT_CONFIRM_DATA = config.MESSAGES['confirm_data'].format
+_FORMAT_EDIT_RESULTS_HEADER = config.MESSAGES['edit_results_header'].format
+_FORMAT_SUCCESS_REGISTER = config.MESSAGES['success_register'].format
+
+# Maximum number of properties listed for a single search
+SEARCH_RESULTS_LIMIT = 25
+
+# Property listings are sent as one paginated message instead of one message per property
+PROPERTIES_PER_PAGE = 5
+PROPERTY_PAGE_SEPARATOR = "\n\n━━━\n\n"
+
+# Telegram rejects text messages longer than this many characters
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+# Main menu shown whenever the user needs to select a goal.
+# Keyboards are immutable, so one instance is shared by every message.
+GOAL_SELECTION_KEYBOARD = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton("🏠 Register Property", callback_data='goal_register'),
+        InlineKeyboardButton("🔍 Search Properties", callback_data='goal_search')
+    ],
+    [
+        InlineKeyboardButton("🔎 Filter by Keyword", callback_data='goal_filter'),
+        InlineKeyboardButton("✏️ Edit Property", callback_data='goal_edit')
+    ],
+    [
+        InlineKeyboardButton("📋 My Properties", callback_data='goal_list'),
+        InlineKeyboardButton("❓ Help", callback_data='goal_help')
+    ]
+])
+
+
+# Property action button labels
+VIEW_BUTTON_TEXT = "👁 View Details"
+DELETE_BUTTON_TEXT = "🗑 Delete"
+EDIT_BUTTON_TEXT = "✏️ Edit This Property"
+CONFIRM_DELETE_BUTTON_TEXT = "✅ Yes, Delete"
+CANCEL_DELETE_BUTTON_TEXT = "❌ No, Cancel"
+
+
+@functools.lru_cache(maxsize=4096)
+def _build_property_actions_keyboard(property_id: int, is_owner: bool, for_editing: bool) -> InlineKeyboardMarkup:
+    """
+    Build (and memoize) the inline keyboard for a property's actions
+    
+    Args:
+        property_id: ID of the property
+        is_owner: Whether current user owns this property
+        for_editing: Whether this keyboard is for selecting property to edit
+    
+    Returns:
+        InlineKeyboardMarkup with appropriate action buttons
+    """
+    if for_editing:
+        # Button to select this property for editing
+        keyboard = [[
+            InlineKeyboardButton(EDIT_BUTTON_TEXT, callback_data=f'edit_{property_id}')
+        ]]
+    elif is_owner:
+        # Owner can view details or delete
+        keyboard = [[
+            InlineKeyboardButton(VIEW_BUTTON_TEXT, callback_data=f'view_{property_id}'),
+            InlineKeyboardButton(DELETE_BUTTON_TEXT, callback_data=f'delete_{property_id}')
+        ]]
+    else:
+        # Non-owner can only view
+        keyboard = [[
+            InlineKeyboardButton(VIEW_BUTTON_TEXT, callback_data=f'view_{property_id}')
+        ]]
+    
+    return InlineKeyboardMarkup(keyboard)
+
+
+@functools.lru_cache(maxsize=1024)
+def _build_confirm_delete_keyboard(property_id: int) -> InlineKeyboardMarkup:
+    """
+    Build (and memoize) the yes/no keyboard shown before deleting a property
+    
+    Args:
+        property_id: ID of the property to delete
+    
+    Returns:
+        InlineKeyboardMarkup with confirm and cancel buttons
+    """
+    return InlineKeyboardMarkup([[
+        InlineKeyboardButton(CONFIRM_DELETE_BUTTON_TEXT, callback_data=f'confirm_delete_{property_id}'),
+        InlineKeyboardButton(CANCEL_DELETE_BUTTON_TEXT, callback_data=f'view_{property_id}')
+    ]])
+
+
+@functools.lru_cache(maxsize=4096)
+def _callback_data(kind: str, value: int) -> str:
+    """
+    Build (and memoize) callback data such as "view_12"
+    Listing pages are re-rendered often, so the same strings are reused
+    
+    Args:
+        kind: Callback prefix (view/delete/edit/page)
+        value: Property ID or page number
+    
+    Returns:
+        Callback data string
+    """
+    return f'{kind}_{value}'
+
+
+def _page_count(total: int) -> int:
+    """Return the number of listing pages needed for total properties"""
+    return max(1, (total + PROPERTIES_PER_PAGE - 1) // PROPERTIES_PER_PAGE)
+
+
+def _build_property_page_keyboard(property_ids, page: int, page_count: int, is_owner: bool, for_editing: bool) -> InlineKeyboardMarkup:
+    """
+    Build the inline keyboard for one page of a property listing
+    
+    Args:
+        property_ids: IDs of the properties shown on this page
+        page: Zero-based page number
+        page_count: Total number of pages in the listing
+        is_owner: Whether current user owns the listed properties
+        for_editing: Whether the listing is for selecting a property to edit
+    
+    Returns:
+        InlineKeyboardMarkup with one row per property and a ◀ ▶ navigation row
+    """
+    keyboard = []
+    
+    for property_id in property_ids:
+        if for_editing:
+            keyboard.append([
+                InlineKeyboardButton(f"✏️ Edit #{property_id}", callback_data=_callback_data('edit', property_id))
+            ])
+        elif is_owner:
+            keyboard.append([
+                InlineKeyboardButton(f"👁 View #{property_id}", callback_data=_callback_data('view', property_id)),
+                InlineKeyboardButton(f"🗑 Delete #{property_id}", callback_data=_callback_data('delete', property_id))
+            ])
+        else:
+            keyboard.append([
+                InlineKeyboardButton(f"👁 View #{property_id}", callback_data=_callback_data('view', property_id))
+            ])
+    
+    navigation = []
+    if page > 0:
+        navigation.append(InlineKeyboardButton("◀", callback_data=_callback_data('page', page - 1)))
+    if page < page_count - 1:
+        navigation.append(InlineKeyboardButton("▶", callback_data=_callback_data('page', page + 1)))
+    if navigation:
+        keyboard.append(navigation)
+    
+    return InlineKeyboardMarkup(keyboard)
+
 # Global handlers for database, AI, and voice processing
 db_manager = DatabaseManager()
 gpt_handler = GptHandler()
 voice_handler = VoiceHandler()
 
+# Caps on concurrently running message handlers: voice handlers are heavy
+# (download + transcription), text handlers are cheap and mostly wait on I/O
+VOICE_HANDLER_SEMAPHORE = asyncio.Semaphore(config.VOICE_MAX_CONCURRENT_HANDLERS)
+TEXT_HANDLER_SEMAPHORE = asyncio.Semaphore(config.TEXT_MAX_CONCURRENT_HANDLERS)
+
+# Per-user locks, so one user's updates are handled one at a time and in order
+# (handlers route on session.state before awaiting GPT). A lock is dropped as soon
+# as no handler holds or waits for it
+_user_locks = weakref.WeakValueDictionary()
+
+
+def _user_lock(update: Update) -> asyncio.Lock:
+    """Get the lock serializing the updates of the user who sent this update"""
+    user_id = update.effective_user.id
+    lock = _user_locks.get(user_id)
+    if lock is None:
+        lock = _user_locks[user_id] = asyncio.Lock()
+    return lock
+
+# Recently handled update IDs; Telegram may deliver the same update again
+# after a network error, and it must not run extraction or DB writes twice
+SEEN_UPDATE_IDS_LIMIT = 10000
+_seen_update_ids = OrderedDict()
+
+
+def _is_duplicate_update(update: Update) -> bool:
+    """
+    Record an update and report whether it has already been handled
+    
+    Args:
+        update: Incoming Telegram update
+    
+    Returns:
+        True if the same update_id was seen recently
+    """
+    if update.update_id in _seen_update_ids:
+        return True
+    
+    _seen_update_ids[update.update_id] = None
+    if len(_seen_update_ids) > SEEN_UPDATE_IDS_LIMIT:
+        _seen_update_ids.popitem(last=False)
+    return False
+
+# Telegram HTTP request pools, keyed by (bot token, pool kind) so that rebuilding
+# the application (e.g. on hot reload) keeps reusing the open connections
+_telegram_requests = {}
+
+
+def get_telegram_request(token: str, for_updates: bool = False) -> HTTPXRequest:
+    """
+    Get the shared Telegram HTTP request pool for a bot token
+    Creates the pool on first use with the configured keep-alive limits
+    Long polling gets its own single-connection pool, so a pending getUpdates
+    call never holds a connection that replies are waiting for
+    
+    Args:
+        token: Telegram bot token
+        for_updates: Return the pool used for getUpdates long polling
+    
+    Returns:
+        HTTPXRequest instance shared by the API calls of this bot
+    """
+    key = (token, for_updates)
+    request = _telegram_requests.get(key)
+    if request is None:
+        request = HTTPXRequest(
+            connection_pool_size=1 if for_updates else config.TELEGRAM_CONNECTION_POOL_SIZE,
+            pool_timeout=config.TELEGRAM_POOL_TIMEOUT,
+            connect_timeout=config.TELEGRAM_CONNECT_TIMEOUT,
+            read_timeout=config.TELEGRAM_READ_TIMEOUT,
+            http_version=config.TELEGRAM_HTTP_VERSION
+        )
+        _telegram_requests[key] = request
+    return request
+
 
 class RealEstateBot:
     """
@@ -52,6 +621,16 @@ class RealEstateBot:
         """Initialize the bot with database and AI handlers"""
         self.db = db_manager
         self.ai = gpt_handler
+        
+        # Inline button handlers keyed by the callback data prefix (text before the first "_")
+        self._callback_handlers = {
+            'goal': self.handle_goal_callback,
+            'page': self.show_property_page,
+            'view': self.view_property,
+            'delete': self.delete_property,
+            'confirm': self.confirm_delete,
+            'edit': self.select_property_for_editing
+        }
     
     # ========================
     # Command Handlers
@@ -63,12 +642,11 @@ class RealEstateBot:
         Shows welcome message and asks user to select their goal first
         """
         # Reset user state to ensure clean start
-        context.user_data.clear()
-        context.user_data['state'] = STATE_WAITING_FOR_GOAL
+        _reset_session(context)
         
         await update.message.reply_text(
             config.MESSAGES['welcome'],
-            reply_markup=self._get_goal_selection_keyboard()
+            reply_markup=GOAL_SELECTION_KEYBOARD
         )
     
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -81,12 +659,11 @@ class RealEstateBot:
         User can restart the process at any time
         """
         # Clear all user data except basic info
-        context.user_data.clear()
-        context.user_data['state'] = STATE_WAITING_FOR_GOAL
+        _reset_session(context)
         
         await update.message.reply_text(
             config.MESSAGES['cancel'],
-            reply_markup=self._get_goal_selection_keyboard()
+            reply_markup=GOAL_SELECTION_KEYBOARD
         )
     
     # ========================
@@ -103,35 +680,37 @@ class RealEstateBot:
             context: Bot context with user data
             goal: Selected goal (register/search/filter/edit/list)
         """
+        session = _get_session(context)
         query = update.callback_query
         await query.answer()
         
         # Set the user's goal and initialize data storage
-        context.user_data['goal'] = goal
-        context.user_data['partial_data'] = {}  # Store accumulated property data
-        context.user_data['conversation_history'] = []  # Track conversation for context
+        session.goal = goal
+        session.partial_data = {}  # Store accumulated property data
+        # Track recent conversation for context (oldest turns are dropped automatically)
+        session.conversation_history = deque(maxlen=config.CONVERSATION_HISTORY_LIMIT)
         
         if goal == 'register':
-            context.user_data['state'] = STATE_REGISTER
+            session.state = STATE_REGISTER
             await query.message.reply_text(config.MESSAGES['register_start'])
             
         elif goal == 'search':
-            context.user_data['state'] = STATE_SEARCH
+            session.state = STATE_SEARCH
             await query.message.reply_text(config.MESSAGES['search_start'])
             
         elif goal == 'filter':
-            context.user_data['state'] = STATE_FILTER
+            session.state = STATE_FILTER
             await query.message.reply_text(config.MESSAGES['filter_start'])
             
         elif goal == 'edit':
-            context.user_data['state'] = STATE_EDIT_FILTER
+            session.state = STATE_EDIT_FILTER
             await query.message.reply_text(config.MESSAGES['edit_start'])
             
         elif goal == 'list':
             # Show user's properties
             await self.show_user_properties(update, context, for_editing=False)
             # Return to goal selection after showing list
-            context.user_data['state'] = STATE_WAITING_FOR_GOAL
+            session.state = STATE_WAITING_FOR_GOAL
     
     # ========================
     # Message Handlers
@@ -141,14 +720,28 @@ class RealEstateBot:
         """
         Handle all text messages from the user
         This is the main text input handler that processes user messages based on current state
+        Concurrent text handlers are capped by TEXT_HANDLER_SEMAPHORE, and each user's
+        updates run one at a time under their user lock
         """
+        if _is_duplicate_update(update):
+            logger.info(f"Ignoring duplicate update {update.update_id}")
+            return
+        
+        async with _user_lock(update), TEXT_HANDLER_SEMAPHORE:
+            await self._process_text_message(update, context)
+    
+    async def _process_text_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Route a text message to the processor for the user's current state"""
+        session = _get_session(context)
         user_message = update.message.text
-        current_state = context.user_data.get('state', STATE_WAITING_FOR_GOAL)
+        # Lowercased once here and shared by the keyword matchers below
+        lower_message = user_message.lower()
+        current_state = session.state
         
         # CRITICAL REQUIREMENT: If no goal is set, force user to select a goal first
-        if current_state == STATE_WAITING_FOR_GOAL or not context.user_data.get('goal'):
+        if current_state == STATE_WAITING_FOR_GOAL or not session.goal:
             # Check if user is trying to select a goal by typing it
-            goal = self._parse_goal_from_text(user_message)
+            goal = self._parse_goal_from_text(user_message, lower_message)
             if goal:
                 # Create a fake callback query to reuse goal selection logic
                 await self._handle_text_goal_selection(update, context, goal)
@@ -156,7 +749,7 @@ class RealEstateBot:
                 # User didn't specify a valid goal, show warning
                 await update.message.reply_text(
                     config.MESSAGES['no_goal_warning'],
-                    reply_markup=self._get_goal_selection_keyboard()
+                    reply_markup=GOAL_SELECTION_KEYBOARD
                 )
             return
         
@@ -171,7 +764,7 @@ class RealEstateBot:
             await self.process_filter_input(update, context, user_message)
             
         elif current_state in [STATE_EDIT_FILTER, STATE_EDIT_SELECTION]:
-            await self.process_edit_filter_input(update, context, user_message)
+            await self.process_edit_filter_input(update, context, user_message, lower_message)
             
         elif current_state == STATE_EDIT:
             await self.process_edit_input(update, context, user_message)
@@ -184,8 +777,21 @@ class RealEstateBot:
         Handle voice messages from the user.
         Converts voice to text using OpenAI's transcription API, then processes like text input.
         Voice input is supported for ALL major actions.
+        Concurrent voice handlers are capped by VOICE_HANDLER_SEMAPHORE, since each
+        one holds a download and a transcription upload in flight; each user's updates
+        run one at a time under their user lock.
         """
-        current_state = context.user_data.get('state', STATE_WAITING_FOR_GOAL)
+        if _is_duplicate_update(update):
+            logger.info(f"Ignoring duplicate update {update.update_id}")
+            return
+        
+        async with _user_lock(update), VOICE_HANDLER_SEMAPHORE:
+            await self._process_voice_message(update, context)
+    
+    async def _process_voice_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Download, transcribe, and route a voice message"""
+        session = _get_session(context)
+        current_state = session.state
         
         # Check if voice service is available
         if not voice_handler.is_available():
@@ -199,20 +805,21 @@ class RealEstateBot:
             )
             return
         
-        # Show processing message
-        processing_msg = await update.message.reply_text("🎤 Converting voice to text...")
+        # Start downloading the voice file from Telegram while the processing message is sent
+        download_task = asyncio.ensure_future(self._download_voice(update.message.voice))
+        
+        # Show processing message, dropping the download if it cannot be sent
+        try:
+            processing_msg = await update.message.reply_text("🎤 Converting voice to text...")
+        except Exception:
+            download_task.cancel()
+            raise
         
         try:
-            # Download voice file from Telegram
-            voice_file = await update.message.voice.get_file()
-            voice_path = f"voice_{update.effective_user.id}_{update.message.message_id}.ogg"
-            await voice_file.download_to_drive(voice_path)
+            voice_audio = await download_task
             
             # Convert voice to text using OpenAI
-            text = await voice_handler.voice_to_text(voice_path)
-            
-            # Clean up: delete the voice file
-            os.remove(voice_path)
+            text = await voice_handler.voice_to_text(voice_audio)
             
             if not text:
                 await processing_msg.edit_text(
@@ -223,11 +830,11 @@ class RealEstateBot:
             
             # Show recognized text to user for confirmation
             await processing_msg.edit_text(
-                config.MESSAGES['voice_recognized'].format(text=text)
+                _FORMAT_VOICE_RECOGNIZED(text=text)
             )
             
             # CRITICAL: Check if user has selected a goal
-            if current_state == STATE_WAITING_FOR_GOAL or not context.user_data.get('goal'):
+            if current_state == STATE_WAITING_FOR_GOAL or not session.goal:
                 # Try to parse goal from voice input
                 goal = self._parse_goal_from_text(text)
                 if goal:
@@ -235,7 +842,7 @@ class RealEstateBot:
                 else:
                     await update.message.reply_text(
                         config.MESSAGES['no_goal_warning'],
-                        reply_markup=self._get_goal_selection_keyboard()
+                        reply_markup=GOAL_SELECTION_KEYBOARD
                     )
                 return
             
@@ -265,6 +872,24 @@ class RealEstateBot:
                 "Please try again or use text input."
             )
     
+    async def _download_voice(self, voice) -> io.BytesIO:
+        """
+        Download a Telegram voice message into memory
+        
+        Args:
+            voice: Telegram Voice object attached to the message
+        
+        Returns:
+            BytesIO positioned at the start of the OGG audio
+        """
+        voice_file = await voice.get_file()
+        voice_audio = io.BytesIO()
+        await voice_file.download_to_memory(out=voice_audio)
+        voice_audio.seek(0)
+        # The transcription API infers the audio format from the file name
+        voice_audio.name = "voice.ogg"
+        return voice_audio
+    
     # ========================
     # Input Processing Methods
     # ========================
@@ -280,22 +905,28 @@ class RealEstateBot:
             context: Bot context with user data
             user_input: User's text or voice-to-text input
         """
+        session = _get_session(context)
         user_id = update.effective_user.id
         
         # Add to conversation history for context
-        context.user_data['conversation_history'].append({
+        session.conversation_history.append({
             'role': 'user',
             'message': user_input
         })
         
-        # Show processing message
-        processing_msg = await update.message.reply_text("⏳ Processing your information...")
+        # Show a typing indicator while the AI extraction runs (no placeholder message to edit later)
+        typing_task = asyncio.ensure_future(update.message.reply_chat_action(ChatAction.TYPING))
         
-        # Extract property information using AI
-        new_data = self.ai.extract_property_info(user_input)
+        try:
+            # Extract property information using AI
+            new_data = await self.ai.extract_property_info(user_input)
+        finally:
+            # The indicator is cosmetic: wait for it even if extraction failed, and let a
+            # failed chat action pass without aborting the turn
+            await asyncio.gather(typing_task, return_exceptions=True)
         
         if not new_data:
-            await processing_msg.edit_text(
+            await update.message.reply_text(
                 "❌ I couldn't understand the property information.\n"
                 "Please provide the details more clearly.\n\n"
                 "Example: 120 square meter apartment in New York, 2 bedrooms, price $500,000"
@@ -304,9 +935,9 @@ class RealEstateBot:
         
         # CRITICAL: Merge with existing partial data (stateful memory)
         # This ensures we never lose previously entered information
-        partial_data = context.user_data.get('partial_data', {})
+        partial_data = session.partial_data
         merged_data = {**partial_data, **new_data}  # New data overwrites old if keys match
-        context.user_data['partial_data'] = merged_data
+        session.partial_data = merged_data
         
         # Validate: check if all required fields are present
         is_valid, missing_fields, validated_data = self.ai.validate_property_data(merged_data)
@@ -316,19 +947,19 @@ class RealEstateBot:
             saved_info = self._format_property_summary(merged_data)
             missing_list = self._format_missing_fields(missing_fields)
             
-            message = config.MESSAGES['missing_info'].format(
+            message = _FORMAT_MISSING_INFO(
                 missing_fields=missing_list,
                 saved_info=saved_info
             )
-            await processing_msg.edit_text(message)
+            await update.message.reply_text(message)
             return
         
         # All required data is present - show confirmation
-        context.user_data['state'] = STATE_CONFIRM
+        session.state = STATE_CONFIRM
         summary = self._format_property_summary(validated_data)
         
-        message = config.MESSAGES['confirm_data'].format(summary=summary)
-        await processing_msg.edit_text(message)
+        message = _FORMAT_CONFIRM_DATA(summary=summary)
+        await update.message.reply_text(message)
     
     async def process_search_input(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_input: str):
         """
@@ -340,8 +971,9 @@ class RealEstateBot:
             context: Bot context with user data
             user_input: User's search criteria
         """
+        session = _get_session(context)
         # Add to conversation history
-        context.user_data['conversation_history'].append({
+        session.conversation_history.append({
             'role': 'user',
             'message': user_input
         })
@@ -350,55 +982,53 @@ class RealEstateBot:
         processing_msg = await update.message.reply_text("🔍 Searching for properties...")
         
         # Extract search filters using AI
-        filters = self.ai.extract_search_filters(user_input)
+        filters = await self.ai.extract_search_filters(user_input)
         
         # Merge with any previously set filters (stateful)
-        existing_filters = context.user_data.get('partial_data', {})
+        existing_filters = session.partial_data
         merged_filters = {**existing_filters, **filters}
-        context.user_data['partial_data'] = merged_filters
+        session.partial_data = merged_filters
         
-        # Search in database
-        properties = self.db.search_properties(merged_filters)
+        # Search in database; one extra row tells us whether more results exist
+        properties = self.db.search_properties_text(merged_filters, limit=SEARCH_RESULTS_LIMIT + 1)
+        has_more = len(properties) > SEARCH_RESULTS_LIMIT
+        properties = properties[:SEARCH_RESULTS_LIMIT]
         
         # Display results
         if not properties:
+            # Return to goal selection (menu attached to the same message)
+            session.state = STATE_WAITING_FOR_GOAL
             await processing_msg.edit_text(
                 "😔 No properties found matching your criteria.\n\n"
                 "Try:\n"
                 "• Broadening your search criteria\n"
                 "• Removing some filters\n"
-                "• Searching in a different location"
-            )
-            # Return to goal selection
-            context.user_data['state'] = STATE_WAITING_FOR_GOAL
-            await update.message.reply_text(
+                "• Searching in a different location\n\n"
                 "What would you like to do next?",
-                reply_markup=self._get_goal_selection_keyboard()
+                reply_markup=GOAL_SELECTION_KEYBOARD
             )
             return
         
         # Show summary
-        count = len(properties)
+        count = f"{len(properties)}+" if has_more else len(properties)
         await processing_msg.edit_text(f"✅ Found {count} properties!")
         
-        # Show each property (limit to 10 to avoid flooding)
-        for prop in properties[:10]:
-            await update.message.reply_text(
-                prop.to_text(),
-                reply_markup=self._get_property_actions_keyboard(prop.id, False)
-            )
+        # Show the results as one paginated message
+        await self._send_property_listing(update.message, context, properties, is_owner=False)
         
-        if len(properties) > 10:
-            await update.message.reply_text(
-                f"📌 {len(properties) - 10} more properties found.\n"
-                "Please refine your search to see more specific results."
+        # Return to goal selection, folding the "more results" note into the same message
+        closing_text = "Search complete! What would you like to do next?"
+        if has_more:
+            closing_text = (
+                "📌 More properties found.\n"
+                "Please refine your search to see more specific results.\n\n"
+                + closing_text
             )
         
-        # Return to goal selection
-        context.user_data['state'] = STATE_WAITING_FOR_GOAL
+        session.state = STATE_WAITING_FOR_GOAL
         await update.message.reply_text(
-            "Search complete! What would you like to do next?",
-            reply_markup=self._get_goal_selection_keyboard()
+            closing_text,
+            reply_markup=GOAL_SELECTION_KEYBOARD
         )
     
     async def process_filter_input(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_input: str):
@@ -414,31 +1044,32 @@ class RealEstateBot:
         processing_msg = await update.message.reply_text("🔎 Filtering properties...")
         
         # Search by keywords in description and other text fields
-        properties = self.db.filter_by_keywords(user_input)
+        properties = [(prop.id, prop.to_text()) for prop in self.db.filter_by_keywords(user_input)]
+        
+        # Return to goal selection
+        _get_session(context).state = STATE_WAITING_FOR_GOAL
         
         if not properties:
+            # Attach the goal menu to the same message instead of sending another one
             await processing_msg.edit_text(
                 f"😔 No properties found with keywords: '{user_input}'\n\n"
-                "Try different keywords or start a new search."
+                "Try different keywords or start a new search.\n\n"
+                "What would you like to do next?",
+                reply_markup=GOAL_SELECTION_KEYBOARD
             )
-        else:
-            count = len(properties)
-            await processing_msg.edit_text(f"✅ Found {count} properties matching your keywords!")
-            
-            for prop in properties[:10]:
-                await update.message.reply_text(
-                    prop.to_text(),
-                    reply_markup=self._get_property_actions_keyboard(prop.id, False)
-                )
+            return
+        
+        count = len(properties)
+        await processing_msg.edit_text(f"✅ Found {count} properties matching your keywords!")
+        
+        await self._send_property_listing(update.message, context, properties, is_owner=False)
         
-        # Return to goal selection
-        context.user_data['state'] = STATE_WAITING_FOR_GOAL
         await update.message.reply_text(
             "What would you like to do next?",
-            reply_markup=self._get_goal_selection_keyboard()
+            reply_markup=GOAL_SELECTION_KEYBOARD
         )
     
-    async def process_edit_filter_input(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_input: str):
+    async def process_edit_filter_input(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_input: str, lower_input: str = None):
         """
         Process filter instructions for editing properties
         Allows user to narrow down which property they want to edit before selecting it
@@ -447,60 +1078,54 @@ class RealEstateBot:
             update: Telegram update object
             context: Bot context with user data
             user_input: Filter criteria or commands (e.g., "show all properties")
+            lower_input: Already lowercased user_input, if the caller has it
         """
+        session = _get_session(context)
         user_id = update.effective_user.id
         text = user_input.strip()
-        lower_text = text.lower()
-        
-        show_all_keywords = [
-            "show all properties",
-            "show all",
-            "list all properties",
-            "see all properties",
-            "display all properties"
-        ]
+        lower_text = lower_input.strip() if lower_input is not None else text.lower()
         
         # Handle request to show every property
-        if any(phrase in lower_text for phrase in show_all_keywords):
-            properties = self.db.get_user_properties(user_id)
+        if _SHOW_ALL_RE.search(lower_text):
+            properties = self.db.search_properties_text({'user_id': user_id})
             
             if not properties:
                 await update.message.reply_text(
                     "You have not registered any properties yet. Add one first, then come back to edit it."
                 )
-                context.user_data['state'] = STATE_WAITING_FOR_GOAL
+                session.state = STATE_WAITING_FOR_GOAL
                 await update.message.reply_text(
                     "What would you like to do next?",
-                    reply_markup=self._get_goal_selection_keyboard()
+                    reply_markup=GOAL_SELECTION_KEYBOARD
                 )
                 return
             
-            await update.message.reply_text(config.MESSAGES['edit_all_listed'].strip())
+            await update.message.reply_text(_EDIT_ALL_LISTED_TEXT)
             await self._send_properties_for_editing(update, context, properties)
-            context.user_data['state'] = STATE_EDIT_SELECTION
+            session.state = STATE_EDIT_SELECTION
             return
         
         # Extract filters using AI
-        filters = self.ai.extract_search_filters(user_input)
+        filters = await self.ai.extract_search_filters(user_input)
         
         if not filters:
-            await update.message.reply_text(config.MESSAGES['edit_need_filters'].strip())
+            await update.message.reply_text(_EDIT_NEED_FILTERS_TEXT)
             return
         
         filters['user_id'] = user_id
-        context.user_data['latest_edit_filters'] = filters
+        session.latest_edit_filters = filters
         
-        properties = self.db.search_properties(filters)
+        properties = self.db.search_properties_text(filters)
         
         if not properties:
-            await update.message.reply_text(config.MESSAGES['edit_no_matches'].strip())
+            await update.message.reply_text(_EDIT_NO_MATCHES_TEXT)
             return
         
         await update.message.reply_text(
-            config.MESSAGES['edit_results_header'].format(count=len(properties))
+            _FORMAT_EDIT_RESULTS_HEADER(count=len(properties))
         )
         await self._send_properties_for_editing(update, context, properties)
-        context.user_data['state'] = STATE_EDIT_SELECTION
+        session.state = STATE_EDIT_SELECTION
     
     async def process_edit_input(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_input: str):
         """
@@ -512,7 +1137,8 @@ class RealEstateBot:
             context: Bot context with user data
             user_input: Update information
         """
-        property_id = context.user_data.get('editing_property_id')
+        session = _get_session(context)
+        property_id = session.editing_property_id
         
         if not property_id:
             await update.message.reply_text(
@@ -523,7 +1149,7 @@ class RealEstateBot:
         processing_msg = await update.message.reply_text("⏳ Processing updates...")
         
         # Extract update information
-        updates = self.ai.extract_property_info(user_input) or {}
+        updates = (await self.ai.extract_property_info(user_input)) or {}
         deletion_updates = self._detect_field_deletions(user_input)
         
         if deletion_updates:
@@ -539,25 +1165,26 @@ class RealEstateBot:
             )
             return
         
-        # Update the property in database
-        success = self.db.update_property(property_id, updates)
+        # Update the property and read it back over the same connection
+        with self.db.transaction() as db_session:
+            success = self.db.update_property(property_id, updates, session=db_session)
+            updated_prop = self.db.get_property(property_id, session=db_session) if success else None
         
         if success:
-            # Get updated property
-            updated_prop = self.db.get_property(property_id)
+            # Show the updated property (and refresh the cached copy)
             await processing_msg.edit_text(
-                "✅ Property updated successfully!\n\n" + updated_prop.to_text()
+                "✅ Property updated successfully!\n\n" + session.cache_property(updated_prop)
             )
         else:
             await processing_msg.edit_text("❌ Failed to update property.")
         
         # Return to goal selection
-        context.user_data.pop('editing_property_id', None)
-        context.user_data.pop('available_edit_property_ids', None)
-        context.user_data['state'] = STATE_WAITING_FOR_GOAL
+        session.editing_property_id = None
+        session.available_edit_property_ids = None
+        session.state = STATE_WAITING_FOR_GOAL
         await update.message.reply_text(
             "What would you like to do next?",
-            reply_markup=self._get_goal_selection_keyboard()
+            reply_markup=GOAL_SELECTION_KEYBOARD
         )
     
     async def process_confirmation(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_input: str):
@@ -570,14 +1197,16 @@ class RealEstateBot:
             context: Bot context with user data
             user_input: User's confirmation response
         """
-        user_input_lower = user_input.lower().strip()
+        session = _get_session(context)
+        # Match whole words only, so e.g. "look" does not count as "ok"
+        tokens = set(_WORD_RE.findall(user_input.lower()))
         
         # Check if user wants to confirm and submit
-        if any(word in user_input_lower for word in ['confirm', 'yes', 'submit', 'ok', 'correct', 'save']):
+        if tokens & _CONFIRM_WORDS:
             await self.finalize_registration(update, context)
             
         # Check if user wants to cancel
-        elif any(word in user_input_lower for word in ['cancel', 'no', 'abort', 'stop']):
+        elif tokens & _CANCEL_WORDS:
             await self.cancel(update, context)
             
         # User wants to add or edit information
@@ -586,20 +1215,20 @@ class RealEstateBot:
             await update.message.reply_text("📝 Updating information...")
             
             # Extract new/updated information
-            new_data = self.ai.extract_property_info(user_input)
+            new_data = await self.ai.extract_property_info(user_input)
             
             if new_data:
                 # Merge with existing data
-                partial_data = context.user_data.get('partial_data', {})
+                partial_data = session.partial_data
                 merged_data = {**partial_data, **new_data}
-                context.user_data['partial_data'] = merged_data
+                session.partial_data = merged_data
                 
                 # Validate again
                 is_valid, missing_fields, validated_data = self.ai.validate_property_data(merged_data)
                 
                 # Show updated summary
                 summary = self._format_property_summary(merged_data)
-                message = config.MESSAGES['confirm_data'].format(summary=summary)
+                message = _FORMAT_CONFIRM_DATA(summary=summary)
                 await update.message.reply_text(message)
             else:
                 await update.message.reply_text(
@@ -616,31 +1245,30 @@ class RealEstateBot:
             update: Telegram update object
             context: Bot context with user data
         """
+        session = _get_session(context)
         user_id = update.effective_user.id
-        property_data = context.user_data.get('partial_data', {})
+        property_data = session.partial_data
         
         try:
-            # Save to database
-            property_id = self.db.add_property(user_id, property_data)
-            
-            # Retrieve saved property
-            saved_property = self.db.get_property(property_id)
+            # Save to database and retrieve the saved property in one transaction
+            with self.db.transaction() as db_session:
+                property_id = self.db.add_property(user_id, property_data, session=db_session)
+                saved_property = self.db.get_property(property_id, session=db_session)
             
             # Show success message
             await update.message.reply_text(
-                config.MESSAGES['success_register'].format(
+                _FORMAT_SUCCESS_REGISTER(
                     property_details=saved_property.to_text()
                 ),
                 reply_markup=self._get_property_actions_keyboard(property_id, True)
             )
             
             # Clear state and return to goal selection
-            context.user_data.clear()
-            context.user_data['state'] = STATE_WAITING_FOR_GOAL
+            _reset_session(context)
             
             await update.message.reply_text(
                 "What would you like to do next?",
-                reply_markup=self._get_goal_selection_keyboard()
+                reply_markup=GOAL_SELECTION_KEYBOARD
             )
             
         except Exception as e:
@@ -666,7 +1294,7 @@ class RealEstateBot:
         user_id = update.effective_user.id
         query = update.callback_query
         
-        properties = self.db.get_user_properties(user_id)
+        properties = self.db.search_properties_text({'user_id': user_id})
         
         if not properties:
             message = (
@@ -681,83 +1309,118 @@ class RealEstateBot:
         
         if for_editing:
             target_message = query.message if query else update.message
-            await target_message.reply_text(config.MESSAGES['edit_all_listed'].strip())
+            await target_message.reply_text(_EDIT_ALL_LISTED_TEXT)
             await self._send_properties_for_editing(update, context, properties)
             return properties
         
-        message = f"📋 You have {len(properties)} properties:\n\n"
         target_message = query.message if query else update.message
-        await target_message.reply_text(message)
-        
-        for prop in properties:
-            keyboard = self._get_property_actions_keyboard(prop.id, True, for_editing=False)
-            await target_message.reply_text(prop.to_text(), reply_markup=keyboard)
+        await self._send_property_listing(
+            target_message, context, properties, is_owner=True,
+            header=f"📋 You have {len(properties)} properties:"
+        )
         
         return properties
 
-    async def _send_properties_for_editing(self, update: Update, context: ContextTypes.DEFAULT_TYPE, properties, limit: int = 10):
+    async def _send_properties_for_editing(self, update: Update, context: ContextTypes.DEFAULT_TYPE, properties):
         """
-        Helper method to send property cards with edit buttons
+        Helper method to send a paginated property listing with edit buttons
         
         Args:
             update: Telegram update object
             context: Bot context
-            properties: Iterable of Property objects
-            limit: Maximum number of property cards to show at once
+            properties: List of (property ID, formatted text) tuples
         """
         if not properties:
             return
         
-        # Store available property IDs for validation later
-        context.user_data['available_edit_property_ids'] = [prop.id for prop in properties]
+        # Store available property IDs for validation later (set for the membership check on selection)
+        _get_session(context).available_edit_property_ids = frozenset(property_id for property_id, _ in properties)
         
         target_message = update.callback_query.message if update.callback_query else update.message
         
-        for prop in properties[:limit]:
-            await target_message.reply_text(
-                prop.to_text(),
-                reply_markup=self._get_property_actions_keyboard(prop.id, True, for_editing=True)
-            )
+        await self._send_property_listing(target_message, context, properties, is_owner=True, for_editing=True)
+        await target_message.reply_text(config.MESSAGES['edit_select_prompt'])
+    
+    async def _send_property_listing(self, target_message, context: ContextTypes.DEFAULT_TYPE, properties, is_owner: bool,
+                                     for_editing: bool = False, header: str = None):
+        """
+        Send properties as a single message, PROPERTIES_PER_PAGE at a time, with ◀ ▶ page buttons
+        The listed IDs are remembered so page callbacks can render the other pages
         
-        if len(properties) > limit:
-            await target_message.reply_text(
-                config.MESSAGES['edit_results_more'].format(remaining=len(properties) - limit)
-            )
+        Args:
+            target_message: Message to reply to
+            context: Bot context with user data
+            properties: List of (property ID, formatted text) tuples to list
+            is_owner: Whether current user owns the listed properties
+            for_editing: Whether the listing is for selecting a property to edit
+            header: Optional text shown above every page
+        """
+        listing = {
+            'ids': [property_id for property_id, _ in properties],
+            'is_owner': is_owner,
+            'for_editing': for_editing,
+            'header': header
+        }
         
-        await target_message.reply_text(config.MESSAGES['edit_select_prompt'])
+        text, keyboard = self._render_property_page(listing, properties[:PROPERTIES_PER_PAGE], 0)
+        message = await target_message.reply_text(text, reply_markup=keyboard)
+        
+        listing['message_id'] = message.message_id
+        _get_session(context).property_listing = listing
+    
+    def _render_property_page(self, listing: dict, properties, page: int):
+        """
+        Render one page of a property listing
+        
+        Args:
+            listing: Listing details stored by _send_property_listing
+            properties: (property ID, formatted text) tuples shown on this page
+            page: Zero-based page number
+        
+        Returns:
+            Tuple of (message text, InlineKeyboardMarkup)
+        """
+        page_count = _page_count(len(listing['ids']))
+        
+        parts = []
+        if listing.get('header'):
+            parts.append(listing['header'] + "\n\n")
+        if page_count > 1:
+            parts.append(f"📄 Page {page + 1}/{page_count}\n\n")
+        parts.append(PROPERTY_PAGE_SEPARATOR.join(text.strip() for _, text in properties))
+        
+        keyboard = _build_property_page_keyboard(
+            [property_id for property_id, _ in properties], page, page_count,
+            listing['is_owner'], listing['for_editing']
+        )
+        return truncate_text(''.join(parts), TELEGRAM_MESSAGE_LIMIT), keyboard
     
-    def _parse_goal_from_text(self, text: str) -> str:
+    def _is_listing_message(self, context: ContextTypes.DEFAULT_TYPE, message) -> bool:
+        """Return True if message is the user's current paginated property listing"""
+        listing = _get_session(context).property_listing
+        return bool(listing) and listing.get('message_id') == message.message_id
+    
+    def _parse_goal_from_text(self, text: str, lower_text: str = None) -> str:
         """
         Parse goal from user's text input
         Detects keywords to identify which goal the user wants
         
         Args:
             text: User's input text
+            lower_text: Already lowercased text, if the caller has it
             
         Returns:
             Goal string (register/search/filter/edit/list) or None
         """
-        text_lower = text.lower()
-        
-        # Keywords for each goal
-        register_keywords = ['register', 'add', 'create', 'new property', 'list property', 'post']
-        search_keywords = ['search', 'find', 'look for', 'looking for', 'want to find']
-        filter_keywords = ['filter', 'keyword', 'contains']
-        edit_keywords = ['edit', 'update', 'modify', 'change']
-        list_keywords = ['list', 'show my', 'my properties', 'view my']
-        
-        if any(keyword in text_lower for keyword in register_keywords):
-            return 'register'
-        elif any(keyword in text_lower for keyword in search_keywords):
-            return 'search'
-        elif any(keyword in text_lower for keyword in filter_keywords):
-            return 'filter'
-        elif any(keyword in text_lower for keyword in edit_keywords):
-            return 'edit'
-        elif any(keyword in text_lower for keyword in list_keywords):
-            return 'list'
+        if lower_text is None:
+            lower_text = text.lower()
         
-        return None
+        # Fast path for a message that is a single keyword
+        goal = _GOAL_EXACT.get(lower_text.strip())
+        if goal:
+            return goal
+        
+        return _match_goal(lower_text)
     
     async def _handle_text_goal_selection(self, update: Update, context: ContextTypes.DEFAULT_TYPE, goal: str):
         """
@@ -768,29 +1431,30 @@ class RealEstateBot:
             context: Bot context with user data
             goal: Detected goal
         """
-        context.user_data['goal'] = goal
-        context.user_data['partial_data'] = {}
-        context.user_data['conversation_history'] = []
+        session = _get_session(context)
+        session.goal = goal
+        session.partial_data = {}
+        session.conversation_history = deque(maxlen=config.CONVERSATION_HISTORY_LIMIT)
         
         if goal == 'register':
-            context.user_data['state'] = STATE_REGISTER
+            session.state = STATE_REGISTER
             await update.message.reply_text(config.MESSAGES['register_start'])
             
         elif goal == 'search':
-            context.user_data['state'] = STATE_SEARCH
+            session.state = STATE_SEARCH
             await update.message.reply_text(config.MESSAGES['search_start'])
             
         elif goal == 'filter':
-            context.user_data['state'] = STATE_FILTER
+            session.state = STATE_FILTER
             await update.message.reply_text(config.MESSAGES['filter_start'])
             
         elif goal == 'edit':
-            context.user_data['state'] = STATE_EDIT
+            session.state = STATE_EDIT
             await self.show_user_properties(update, context, for_editing=True)
             
         elif goal == 'list':
             await self.show_user_properties(update, context, for_editing=False)
-            context.user_data['state'] = STATE_WAITING_FOR_GOAL
+            session.state = STATE_WAITING_FOR_GOAL
     
     def _format_property_summary(self, property_data: dict) -> str:
         """
@@ -802,38 +1466,22 @@ class RealEstateBot:
         Returns:
             Formatted string summary
         """
+        if not property_data:
+            return "No information collected yet."
+        
         summary = []
         
-        field_labels = {
-            'title': '🏠 Title',
-            'property_type': '🏢 Type',
-            'city': '🌆 City',
-            'neighborhood': '📍 Neighborhood',
-            'address': '📮 Address',
-            'area': '📐 Area',
-            'price': '💰 Price',
-            'rooms': '🛏 Bedrooms',
-            'floor': '🏗 Floor',
-            'year_built': '📅 Year Built',
-            'parking': '🅿️ Parking',
-            'elevator': '🛗 Elevator',
-            'storage': '📦 Storage',
-            'description': '📝 Description'
-        }
+        # Walk only the keys present, in display order
+        present_keys = sorted(
+            (key for key in property_data if key in _FIELD_ORDER),
+            key=_FIELD_ORDER.__getitem__
+        )
         
-        for key, label in field_labels.items():
-            if key in property_data and property_data[key] not in [None, '', 'null']:
-                value = property_data[key]
-                
-                # Format boolean values
-                if isinstance(value, bool):
-                    value = 'Yes' if value else 'No'
-                
-                # Format numbers with commas
-                elif key in ['price', 'area'] and isinstance(value, (int, float)):
-                    value = f"{value:,.2f}"
-                
-                summary.append(f"{label}: {value}")
+        for key in present_keys:
+            label = _FIELD_LABEL_MAP[key]
+            value = property_data[key]
+            if value not in _EMPTY_SENTINELS:
+                summary.append(f"{label}: {_FIELD_FORMATTERS.get(key, str)(value)}")
         
         return '\n'.join(summary) if summary else "No information collected yet."
     
@@ -847,17 +1495,7 @@ class RealEstateBot:
         Returns:
             Formatted string listing missing fields
         """
-        field_names = {
-            'title': 'Property title',
-            'property_type': 'Property type (apartment, house, etc.)',
-            'city': 'City',
-            'neighborhood': 'Neighborhood',
-            'area': 'Size/Area',
-            'price': 'Price',
-            'rooms': 'Number of bedrooms'
-        }
-        
-        formatted = [f"• {field_names.get(f, f)}" for f in missing_fields]
+        formatted = [f"• {_FIELD_NAMES.get(f, f)}" for f in missing_fields]
         return '\n'.join(formatted)
     
     def _detect_field_deletions(self, text: str) -> dict:
@@ -874,97 +1512,20 @@ class RealEstateBot:
         if not text:
             return {}
         
-        deletion_keywords = ['delete', 'remove', 'clear', 'erase', 'drop']
-        reset_keywords = ['set', 'make']
-        negative_keywords = ['no', 'without']
-        
-        field_synonyms = {
-            'description': ['description', 'details', 'summary', 'notes', 'note'],
-            'address': ['address', 'location details'],
-            'neighborhood': ['neighborhood', 'district', 'area name'],
-            'title': ['title', 'headline'],
-            'parking': ['parking', 'garage', 'car park'],
-            'elevator': ['elevator', 'lift'],
-            'storage': ['storage', 'storage room', 'locker', 'pantry']
-        }
-        boolean_fields = {'parking', 'elevator', 'storage'}
+        # Collapse whitespace runs so phrases match across line breaks and double spaces
+        normalized = _WS_RE.sub(' ', text.lower()).strip()
+        trigger = _DELETION_PREFILTER_RE.search(normalized)
+        if not trigger:
+            return {}
         
-        normalized = ' '.join(text.lower().split())
         removals = {}
+        scan_start = max(0, trigger.start() - _DELETION_MAX_TRIGGER_OFFSET)
         
-        for field, synonyms in field_synonyms.items():
-            for synonym in synonyms:
-                # Direct deletion commands (delete/remove/clear ...)
-                for keyword in deletion_keywords:
-                    patterns = [
-                        f"{keyword} {synonym}",
-                        f"{keyword} the {synonym}",
-                        f"{keyword} this {synonym}",
-                        f"{keyword} that {synonym}",
-                        f"{keyword} my {synonym}",
-                        f"{keyword} the {synonym} field"
-                    ]
-                    if any(pattern in normalized for pattern in patterns):
-                        removals[field] = False if field in boolean_fields else None
-                        break  # No need to check other keywords for this synonym
-                if field in removals:
-                    continue
-                
-                # Reset commands (set description to none/null/empty)
-                for keyword in reset_keywords:
-                    patterns = [
-                        f"{keyword} {synonym} to none",
-                        f"{keyword} {synonym} to null",
-                        f"{keyword} {synonym} to empty",
-                        f"{keyword} {synonym} to blank",
-                        f"{keyword} the {synonym} to none",
-                        f"{keyword} the {synonym} to null"
-                    ]
-                    if any(pattern in normalized for pattern in patterns):
-                        removals[field] = False if field in boolean_fields else None
-                        break
-                if field in removals:
-                    continue
-                
-                # Negative phrases for booleans (no parking / without elevator)
-                if field in boolean_fields:
-                    patterns = [
-                        f"{negative_keywords[0]} {synonym}",
-                        f"{negative_keywords[1]} {synonym}",
-                        f"there is {negative_keywords[0]} {synonym}",
-                        f"{synonym} is not needed",
-                        f"{synonym} not needed"
-                    ]
-                    if any(pattern in normalized for pattern in patterns):
-                        removals[field] = False
-                        continue
+        for match in FIELD_DELETION_RE.finditer(normalized, scan_start):
+            removals[match.lastgroup] = FIELD_CLEARED_VALUES[match.lastgroup]
         
         return removals
     
-    def _get_goal_selection_keyboard(self):
-        """
-        Create inline keyboard for goal selection
-        This is the main menu that appears when user needs to select their goal
-        
-        Returns:
-            InlineKeyboardMarkup with goal options
-        """
-        keyboard = [
-            [
-                InlineKeyboardButton("🏠 Register Property", callback_data='goal_register'),
-                InlineKeyboardButton("🔍 Search Properties", callback_data='goal_search')
-            ],
-            [
-                InlineKeyboardButton("🔎 Filter by Keyword", callback_data='goal_filter'),
-                InlineKeyboardButton("✏️ Edit Property", callback_data='goal_edit')
-            ],
-            [
-                InlineKeyboardButton("📋 My Properties", callback_data='goal_list'),
-                InlineKeyboardButton("❓ Help", callback_data='goal_help')
-            ]
-        ]
-        return InlineKeyboardMarkup(keyboard)
-    
     def _get_property_actions_keyboard(self, property_id: int, is_owner: bool, for_editing: bool = False):
         """
         Create inline keyboard for property actions
@@ -977,26 +1538,7 @@ class RealEstateBot:
         Returns:
             InlineKeyboardMarkup with appropriate action buttons
         """
-        keyboard = []
-        
-        if for_editing:
-            # Button to select this property for editing
-            keyboard.append([
-                InlineKeyboardButton("✏️ Edit This Property", callback_data=f'edit_{property_id}')
-            ])
-        elif is_owner:
-            # Owner can view details or delete
-            keyboard.append([
-                InlineKeyboardButton("👁 View Details", callback_data=f'view_{property_id}'),
-                InlineKeyboardButton("🗑 Delete", callback_data=f'delete_{property_id}')
-            ])
-        else:
-            # Non-owner can only view
-            keyboard.append([
-                InlineKeyboardButton("👁 View Details", callback_data=f'view_{property_id}')
-            ])
-        
-        return InlineKeyboardMarkup(keyboard)
+        return _build_property_actions_keyboard(property_id, is_owner, for_editing)
     
     # ========================
     # Callback Query Handlers
@@ -1005,109 +1547,188 @@ class RealEstateBot:
     async def handle_callback_query(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """
         Handle all inline keyboard button callbacks
-        Routes different callback types to appropriate handlers
+        Routes different callback types to appropriate handlers,
+        one at a time per user like text and voice messages
         """
+        async with _user_lock(update):
+            query = update.callback_query
+            await query.answer()
+            
+            # Split "view_12" into ("view", "12") and hand the payload to the prefix's handler
+            prefix, _, payload = query.data.partition('_')
+            handler = self._callback_handlers.get(prefix)
+            
+            if handler:
+                await handler(update, context, payload)
+    
+    async def handle_goal_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE, goal: str):
+        """Handle a goal button from the main menu"""
         query = update.callback_query
-        await query.answer()
-        
-        data = query.data
         
-        # Goal selection callbacks
-        if data.startswith('goal_'):
-            goal = data.replace('goal_', '')
-            if goal == 'help':
-                await query.message.reply_text(config.MESSAGES['help'])
-            else:
-                await self.handle_goal_selection(update, context, goal)
-        
-        # Property action callbacks
-        elif data.startswith('view_'):
-            await self.view_property(update, context)
-        
-        elif data.startswith('delete_'):
-            await self.delete_property(update, context)
+        if goal == 'help':
+            await query.message.reply_text(config.MESSAGES['help'])
+        else:
+            await self.handle_goal_selection(update, context, goal)
+    
+    async def select_property_for_editing(self, update: Update, context: ContextTypes.DEFAULT_TYPE, payload: str):
+        """Set the chosen property as the one being edited"""
+        session = _get_session(context)
+        query = update.callback_query
+        property_id = int(payload)
+        property_obj = self.db.get_property(property_id)
+        allowed_ids = session.available_edit_property_ids
         
-        elif data.startswith('confirm_delete_'):
-            await self.confirm_delete(update, context)
+        if not property_obj or property_obj.user_id != update.effective_user.id:
+            await query.message.reply_text(
+                "❌ You can edit only your own properties. Please pick one from the list I showed you."
+            )
+            return
         
-        elif data.startswith('edit_'):
-            # Set property for editing
-            property_id = int(data.split('_')[1])
-            property_obj = self.db.get_property(property_id)
-            allowed_ids = context.user_data.get('available_edit_property_ids')
-            
-            if not property_obj or property_obj.user_id != update.effective_user.id:
-                await query.message.reply_text(
-                    "❌ You can edit only your own properties. Please pick one from the list I showed you."
-                )
-                return
-            
-            if allowed_ids and property_id not in allowed_ids:
-                await query.message.reply_text(
-                    "⚠️ That property was not in the latest results. Please describe the property again or type \"show all properties\"."
-                )
-                return
-            
-            context.user_data['editing_property_id'] = property_id
-            context.user_data['state'] = STATE_EDIT
-            
+        if allowed_ids and property_id not in allowed_ids:
             await query.message.reply_text(
-                f"✏️ Editing property #{property_id}\n\n"
-                "Tell me what you want to change (you can use text or voice).\n\n"
-                "Examples:\n"
-                "• \"Change price to $600,000\"\n"
-                "• \"Remove the description\"\n"
-                "• \"Add elevator and parking\""
+                "⚠️ That property was not in the latest results. Please describe the property again or type \"show all properties\"."
             )
+            return
+        
+        session.editing_property_id = property_id
+        session.state = STATE_EDIT
+        
+        await query.message.reply_text(
+            f"✏️ Editing property #{property_id}\n\n"
+            "Tell me what you want to change (you can use text or voice).\n\n"
+            "Examples:\n"
+            "• \"Change price to $600,000\"\n"
+            "• \"Remove the description\"\n"
+            "• \"Add elevator and parking\""
+        )
     
-    async def view_property(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """View detailed information about a property"""
+    async def show_property_page(self, update: Update, context: ContextTypes.DEFAULT_TYPE, payload: str):
+        """Show another page of the user's current property listing"""
         query = update.callback_query
-        property_id = int(query.data.split('_')[1])
+        page = int(payload)
+        
+        if not self._is_listing_message(context, query.message):
+            await query.message.reply_text("⚠️ This list has expired. Please run your search again.")
+            return
         
-        prop = self.db.get_property(property_id)
+        listing = _get_session(context).property_listing
+        page = max(0, min(page, _page_count(len(listing['ids'])) - 1))
+        start = page * PROPERTIES_PER_PAGE
+        page_ids = listing['ids'][start:start + PROPERTIES_PER_PAGE]
         
-        if prop:
+        # Properties may have been deleted since the listing was sent
+        properties = self.db.get_properties_text(page_ids)
+        if not properties:
+            await query.edit_message_text("❌ These properties are no longer available.")
+            return
+        
+        text, keyboard = self._render_property_page(listing, properties, page)
+        await query.edit_message_text(text, reply_markup=keyboard)
+    
+    async def view_property(self, update: Update, context: ContextTypes.DEFAULT_TYPE, payload: str):
+        """View detailed information about a property"""
+        query = update.callback_query
+        property_id = int(payload)
+        session = _get_session(context)
+        
+        # "No, Cancel" on a delete confirmation comes back here for the same property,
+        # so repeat views reuse the text rendered the first time
+        cached = session.get_cached_property(property_id)
+        if cached is None:
+            prop = self.db.get_property(property_id)
+            if prop:
+                cached = prop.user_id, session.cache_property(prop)
+        
+        if cached:
+            owner_id, text = cached
             user_id = update.effective_user.id
-            is_owner = (prop.user_id == user_id)
+            is_owner = (owner_id == user_id)
+            keyboard = self._get_property_actions_keyboard(property_id, is_owner)
             
-            await query.edit_message_text(
-                prop.to_text(),
-                reply_markup=self._get_property_actions_keyboard(property_id, is_owner)
-            )
+            # Keep a paginated listing intact and show the details underneath it
+            if self._is_listing_message(context, query.message):
+                await query.message.reply_text(text, reply_markup=keyboard)
+            else:
+                await query.edit_message_text(text, reply_markup=keyboard)
         else:
             await query.edit_message_text("❌ Property not found.")
     
-    async def delete_property(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def delete_property(self, update: Update, context: ContextTypes.DEFAULT_TYPE, payload: str):
         """Request confirmation before deleting a property"""
         query = update.callback_query
-        property_id = int(query.data.split('_')[1])
+        property_id = int(payload)
         
-        keyboard = [
-            [
-                InlineKeyboardButton("✅ Yes, Delete", callback_data=f'confirm_delete_{property_id}'),
-                InlineKeyboardButton("❌ No, Cancel", callback_data=f'view_{property_id}')
-            ]
-        ]
+        keyboard = _build_confirm_delete_keyboard(property_id)
         
-        await query.edit_message_text(
+        confirmation_text = (
             "⚠️ Are you sure you want to delete this property?\n\n"
-            "This action cannot be undone.",
-            reply_markup=InlineKeyboardMarkup(keyboard)
+            "This action cannot be undone."
         )
+        
+        # Keep a paginated listing intact and ask for confirmation underneath it
+        if self._is_listing_message(context, query.message):
+            await query.message.reply_text(confirmation_text, reply_markup=keyboard)
+        else:
+            await query.edit_message_text(confirmation_text, reply_markup=keyboard)
     
-    async def confirm_delete(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+    async def confirm_delete(self, update: Update, context: ContextTypes.DEFAULT_TYPE, payload: str):
         """Confirm and execute property deletion"""
         query = update.callback_query
-        property_id = int(query.data.split('_')[2])
+        # Payload is "delete_<id>"
+        property_id = int(payload.rpartition('_')[2])
         user_id = update.effective_user.id
         
         if self.db.delete_property(property_id, user_id):
+            _get_session(context).forget_property(property_id)
             await query.edit_message_text("✅ Property successfully deleted.")
         else:
             await query.edit_message_text("❌ Error deleting property.")
 
 
+async def _post_shutdown(application: Application):
+    """
+    Release database and OpenAI connections when the application stops
+    
+    Args:
+        application: The stopping Telegram application
+    """
+    await close_session()
+    db_manager.close()
+
+
+def build_application(token: str) -> Application:
+    """
+    Build the Telegram application with the shared HTTP pools and optional persistence
+    
+    Args:
+        token: Telegram bot token
+    
+    Returns:
+        Configured Application (handlers are added by the caller)
+    """
+    builder = (
+        Application.builder()
+        .token(token)
+        .request(get_telegram_request(token))
+        .get_updates_request(get_telegram_request(token, for_updates=True))
+        .post_shutdown(_post_shutdown)
+        # Handle updates concurrently instead of one at a time; message and button
+        # handlers take a per-user lock, so only different users' updates overlap,
+        # and the per-handler semaphores still cap how many text/voice handlers run
+        .concurrent_updates(config.MAX_CONCURRENT_UPDATES)
+    )
+    
+    # Keep per-user conversation state across restarts when a state file is configured
+    if config.BOT_PERSISTENCE_FILE:
+        builder = builder.persistence(PicklePersistence(
+            filepath=config.BOT_PERSISTENCE_FILE,
+            store_data=PersistenceInput(bot_data=False, chat_data=False, user_data=True, callback_data=False),
+            update_interval=config.BOT_PERSISTENCE_INTERVAL
+        ))
+    
+    return builder.build()
+
+
 def main():
     """
     Main function to run the bot
@@ -1129,7 +1750,7 @@ def main():
     bot = RealEstateBot()
     
     # Build application
-    application = Application.builder().token(config.TELEGRAM_BOT_TOKEN).build()
+    application = build_application(config.TELEGRAM_BOT_TOKEN)
     
     # Add command handlers
     application.add_handler(CommandHandler('start', bot.start))
@@ -4,6 +4,7 @@ This file contains all configuration settings, messages, and prompts for the bot
 All text is in English as per requirements.
 """
 import os
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -12,20 +13,58 @@ load_dotenv()
 # Telegram Bot Configuration
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 
+# Telegram HTTP connection pool (shared by all bot API calls)
+TELEGRAM_CONNECTION_POOL_SIZE = int(os.getenv('TELEGRAM_CONNECTION_POOL_SIZE', '256'))
+TELEGRAM_POOL_TIMEOUT = float(os.getenv('TELEGRAM_POOL_TIMEOUT', '5.0'))
+TELEGRAM_CONNECT_TIMEOUT = float(os.getenv('TELEGRAM_CONNECT_TIMEOUT', '3.0'))
+TELEGRAM_READ_TIMEOUT = float(os.getenv('TELEGRAM_READ_TIMEOUT', '5.0'))
+# Set to "2" to enable HTTP/2 (requires the httpx[http2] extra)
+TELEGRAM_HTTP_VERSION = os.getenv('TELEGRAM_HTTP_VERSION', '1.1')
+
 # OpenAI API Configuration
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
 OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4o')
 OPENAI_TRANSCRIPTION_MODEL = os.getenv('OPENAI_TRANSCRIPTION_MODEL', 'gpt-4o-mini-transcribe')
+# Optional smaller model tried first for short extraction requests (e.g. gpt-4o-mini).
+# Falls back to OPENAI_MODEL when the fast model extracts nothing.
+OPENAI_FAST_MODEL = os.getenv('OPENAI_FAST_MODEL', '')
+FAST_EXTRACTION_MAX_CHARS = int(os.getenv('FAST_EXTRACTION_MAX_CHARS', '300'))
+
+# Cache of extraction replies, so repeated messages skip the API call (size 0 disables it)
+OPENAI_RESPONSE_CACHE_SIZE = int(os.getenv('OPENAI_RESPONSE_CACHE_SIZE', '2048'))
+OPENAI_RESPONSE_CACHE_TTL = float(os.getenv('OPENAI_RESPONSE_CACHE_TTL', '3600'))
+
+# Maximum number of voice messages transcribed at the same time
+VOICE_MAX_CONCURRENCY = int(os.getenv('VOICE_MAX_CONCURRENCY', '8'))
+
+# Maximum number of voice / text message handlers running at the same time
+VOICE_MAX_CONCURRENT_HANDLERS = int(os.getenv('VOICE_MAX_CONCURRENT_HANDLERS', '8'))
+TEXT_MAX_CONCURRENT_HANDLERS = int(os.getenv('TEXT_MAX_CONCURRENT_HANDLERS', '100'))
+
+# Maximum number of updates processed concurrently by the application
+MAX_CONCURRENT_UPDATES = int(os.getenv('MAX_CONCURRENT_UPDATES', '256'))
 
 # Database Configuration
 DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///real_estate.db')
+# Connection pool limits (ignored for SQLite)
+DATABASE_POOL_SIZE = int(os.getenv('DATABASE_POOL_SIZE', '20'))
+DATABASE_MAX_OVERFLOW = int(os.getenv('DATABASE_MAX_OVERFLOW', '40'))
+DATABASE_POOL_RECYCLE = int(os.getenv('DATABASE_POOL_RECYCLE', '1800'))
+
+# Conversation State Persistence
+# When set, per-user conversation state is saved to this file and survives restarts
+BOT_PERSISTENCE_FILE = os.getenv('BOT_PERSISTENCE_FILE')
+BOT_PERSISTENCE_INTERVAL = float(os.getenv('BOT_PERSISTENCE_INTERVAL', '60'))
+
+# Number of recent messages kept per user as conversation context
+CONVERSATION_HISTORY_LIMIT = int(os.getenv('CONVERSATION_HISTORY_LIMIT', '20'))
 
 # Administrative Settings
-BOT_ADMIN_IDS = [int(id_) for id_ in os.getenv('BOT_ADMIN_IDS', '').split(',') if id_.strip()]
+BOT_ADMIN_IDS = frozenset(int(id_) for id_ in os.getenv('BOT_ADMIN_IDS', '').split(',') if id_.strip())
 LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
 
-# Bot Messages in English
-MESSAGES = {
+# Bot Messages in English (read-only at runtime)
+MESSAGES = MappingProxyType({
     'welcome': """
 🏠 Welcome to the Real Estate Management Chatbot!
 
@@ -159,7 +198,6 @@ or type "show all properties" to see your entire list.
 Please refine the details or type "show all properties" to view everything.
 """,
     'edit_results_header': "✅ I found {count} properties that match your description. Pick one below to start editing:",
-    'edit_results_more': "📌 {remaining} additional properties are available. Refine your filters to narrow the list.",
     'edit_all_listed': """
 📋 Here are all of your properties.
 
@@ -221,7 +259,7 @@ Processing your request...
 
 Select an option from the menu below:
 """,
-}
+})
 
 # AI Prompts for Property Information Extraction
 PROPERTY_EXTRACTION_PROMPT = """
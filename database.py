@@ -4,9 +4,13 @@ Handles all database operations for property management.
 Uses SQLAlchemy ORM for database interactions.
 All code comments and docstrings are in English.
 """
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, Text, or_
+from sqlalchemy import create_engine, event, case, column, func, insert, lambda_stmt, select, text, Column, Index, Integer, String, Float, Boolean, DateTime, Text, or_
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from contextlib import contextmanager
 from datetime import datetime
 import config
 
@@ -20,17 +24,25 @@ class Property(Base):
     Stores all property information including location, specs, and amenities
     """
     __tablename__ = 'properties'
+    __table_args__ = (
+        # City + price/area ranges, the most common search shape
+        Index('ix_city_price_area', 'city', 'price', 'area'),
+        # A user's properties, newest first
+        Index('ix_user_created', 'user_id', 'created_at'),
+        # Price ranges; also covers the statistics aggregate (index-only scan)
+        Index('ix_price_area', 'price', 'area'),
+    )
     
     # Primary key
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_id = Column(Integer, nullable=False, index=True)
+    user_id = Column(Integer, nullable=False)
     
     # Basic information
     title = Column(String(200), nullable=False)
     property_type = Column(String(50), nullable=False)  # apartment, house, villa, land, etc.
     
     # Location information
-    city = Column(String(100), nullable=False, index=True)
+    city = Column(String(100), nullable=False)
     neighborhood = Column(String(100), index=True)
     address = Column(Text)
     
@@ -41,7 +53,7 @@ class Property(Base):
     year_built = Column(Integer)  # Year of construction
     
     # Financial information
-    price = Column(Float, nullable=False, index=True)  # Price in local currency
+    price = Column(Float, nullable=False)  # Price in local currency
     
     # Amenities
     parking = Column(Boolean, default=False)
@@ -51,7 +63,7 @@ class Property(Base):
     # Additional details
     description = Column(Text)
     
-    # Timestamps
+    # Timestamps (local time); updated_at is refreshed on every ORM or Core update
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     
@@ -92,48 +104,241 @@ class Property(Base):
         Returns:
             Formatted text string
         """
-        amenities = []
-        if self.parking:
-            amenities.append('Parking')
-        if self.elevator:
-            amenities.append('Elevator')
-        if self.storage:
-            amenities.append('Storage')
-        
-        text = f"""
-🏠 {self.title}
-━━━━━━━━━━━━━━━━━━━━
-📍 Location: {self.city}"""
-        
-        if self.neighborhood:
-            text += f", {self.neighborhood}"
-        
-        text += f"""
-📐 Area: {self.area} sq m
-💰 Price: ${self.price:,.0f}
-🏢 Type: {self.property_type}"""
-        
-        if self.rooms:
-            text += f"\n🛏 Bedrooms: {self.rooms}"
-        
-        if self.floor:
-            text += f"\n🏗 Floor: {self.floor}"
-        
-        if self.year_built:
-            text += f"\n📅 Year Built: {self.year_built}"
-        
-        if amenities:
-            text += f"\n✨ Amenities: {' | '.join(amenities)}"
-        
-        if self.address:
-            text += f"\n📮 Address: {self.address}"
-        
-        if self.description:
-            text += f"\n📝 Description: {self.description}"
-        
-        text += f"\n\n🆔 ID: {self.id}"
-        
-        return text
+        return render_property_text(self)
+
+
+# Columns needed to render a property for display, selected without building ORM objects
+PROPERTY_TEXT_COLUMNS = (
+    Property.id, Property.title, Property.property_type, Property.city, Property.neighborhood,
+    Property.address, Property.area, Property.rooms, Property.floor, Property.year_built,
+    Property.price, Property.parking, Property.elevator, Property.storage, Property.description
+)
+
+# Columns needed for a one-line property overview in list views
+PROPERTY_LIST_COLUMNS = (
+    Property.id, Property.title, Property.city, Property.price, Property.area, Property.property_type
+)
+
+
+def render_property_text(prop):
+    """
+    Format property information for display in Telegram messages
+    Works with Property objects and with rows selected from PROPERTY_TEXT_COLUMNS
+    
+    Args:
+        prop: Property object or row with the same attribute names
+    
+    Returns:
+        Formatted text string
+    """
+    amenities = []
+    if prop.parking:
+        amenities.append('Parking')
+    if prop.elevator:
+        amenities.append('Elevator')
+    if prop.storage:
+        amenities.append('Storage')
+    
+    location = f"{prop.city}, {prop.neighborhood}" if prop.neighborhood else prop.city
+    
+    # Collect the lines and join them once at the end
+    lines = [
+        '',
+        f"🏠 {prop.title}",
+        "━━━━━━━━━━━━━━━━━━━━",
+        f"📍 Location: {location}",
+        f"📐 Area: {prop.area} sq m",
+        f"💰 Price: ${prop.price:,.0f}",
+        f"🏢 Type: {prop.property_type}"
+    ]
+    
+    if prop.rooms:
+        lines.append(f"🛏 Bedrooms: {prop.rooms}")
+    
+    if prop.floor:
+        lines.append(f"🏗 Floor: {prop.floor}")
+    
+    if prop.year_built:
+        lines.append(f"📅 Year Built: {prop.year_built}")
+    
+    if amenities:
+        lines.append(f"✨ Amenities: {' | '.join(amenities)}")
+    
+    if prop.address:
+        lines.append(f"📮 Address: {prop.address}")
+    
+    if prop.description:
+        lines.append(f"📝 Description: {prop.description}")
+    
+    lines.append('')
+    lines.append(f"🆔 ID: {prop.id}")
+    
+    return '\n'.join(lines)
+
+
+def rows_to_dicts(rows):
+    """
+    Convert property row mappings to the same dictionaries as Property.to_dict
+    For lists selected with .mappings() from the properties table, so no ORM
+    objects are built and no instrumented attributes are read
+    
+    Args:
+        rows: Row mappings containing every properties column
+    
+    Returns:
+        List of property dictionaries
+    """
+    dicts = []
+    for row in rows:
+        data = dict(row)
+        for key in ('created_at', 'updated_at'):
+            if data[key]:
+                data[key] = data[key].isoformat()
+        dicts.append(data)
+    return dicts
+
+
+# Rows fetched per batch when results are streamed
+STREAM_BATCH_SIZE = 200
+
+# Text columns searched by filter_by_keywords
+KEYWORD_SEARCH_COLUMNS = ('title', 'description', 'address', 'property_type', 'city', 'neighborhood')
+
+# SQLite keyword index: an FTS5 trigram table over the searched columns, kept in sync
+# with the properties table by triggers. Trigram MATCH finds the same substrings as
+# LIKE '%...%' but through the index; it needs at least 3 characters to search.
+KEYWORD_INDEX_MIN_LENGTH = 3
+
+_KEYWORD_INDEX_COLUMNS = ', '.join(KEYWORD_SEARCH_COLUMNS)
+_KEYWORD_INDEX_OLD_VALUES = ', '.join(f'old.{name}' for name in KEYWORD_SEARCH_COLUMNS)
+_KEYWORD_INDEX_NEW_VALUES = ', '.join(f'new.{name}' for name in KEYWORD_SEARCH_COLUMNS)
+_SQLITE_KEYWORD_INDEX_DDL = (
+    f"""CREATE VIRTUAL TABLE properties_fts USING fts5(
+        {_KEYWORD_INDEX_COLUMNS}, content='properties', content_rowid='id', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER properties_fts_insert AFTER INSERT ON properties BEGIN
+        INSERT INTO properties_fts(rowid, {_KEYWORD_INDEX_COLUMNS}) VALUES (new.id, {_KEYWORD_INDEX_NEW_VALUES});
+    END""",
+    f"""CREATE TRIGGER properties_fts_delete AFTER DELETE ON properties BEGIN
+        INSERT INTO properties_fts(properties_fts, rowid, {_KEYWORD_INDEX_COLUMNS})
+        VALUES ('delete', old.id, {_KEYWORD_INDEX_OLD_VALUES});
+    END""",
+    f"""CREATE TRIGGER properties_fts_update AFTER UPDATE ON properties BEGIN
+        INSERT INTO properties_fts(properties_fts, rowid, {_KEYWORD_INDEX_COLUMNS})
+        VALUES ('delete', old.id, {_KEYWORD_INDEX_OLD_VALUES});
+        INSERT INTO properties_fts(rowid, {_KEYWORD_INDEX_COLUMNS}) VALUES (new.id, {_KEYWORD_INDEX_NEW_VALUES});
+    END""",
+    # Index the rows that existed before the keyword index was added
+    "INSERT INTO properties_fts(properties_fts) VALUES ('rebuild')",
+)
+_KEYWORD_INDEX_QUERY = text(
+    "SELECT rowid FROM properties_fts WHERE properties_fts MATCH :pattern"
+).columns(column('rowid', Integer))
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune every new SQLite connection: write-ahead logging so readers do not block
+    the writer, fewer fsyncs per commit, and memory-mapped / in-memory temp storage
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+    finally:
+        cursor.close()
+
+
+def _normalize_property_row(user_id, property_data):
+    """
+    Build the column values for a new property from extracted property data
+    Applies the same defaults and numeric coercion for every insert path
+    
+    Args:
+        user_id: Telegram user ID of the property owner
+        property_data: Dictionary containing property information
+    
+    Returns:
+        Dictionary of column name -> value for the properties table
+    """
+    return {
+        'user_id': user_id,
+        'title': property_data.get('title', 'Untitled Property'),
+        'property_type': property_data.get('property_type', 'Apartment'),
+        'city': property_data.get('city', ''),
+        'neighborhood': property_data.get('neighborhood'),
+        'address': property_data.get('address'),
+        'area': float(property_data.get('area', 0)),
+        'rooms': property_data.get('rooms'),
+        'floor': property_data.get('floor'),
+        'year_built': property_data.get('year_built'),
+        'price': float(property_data.get('price', 0)),
+        'parking': property_data.get('parking', False),
+        'elevator': property_data.get('elevator', False),
+        'storage': property_data.get('storage', False),
+        'description': property_data.get('description')
+    }
+
+
+# Search filters as (filter key, also match False, statement step) entries
+# A filter applies when its value is truthy; amenity flags also apply when False
+# Each step is its own lambda, so lambda_stmt caches one statement per filter
+# combination and binds the value as a parameter
+_SEARCH_FILTERS = (
+    ('user_id', False, lambda value: lambda s: s.where(Property.user_id == value)),
+    ('property_type', False, lambda value: lambda s: s.where(Property.property_type.contains(value))),
+    ('city', False, lambda value: lambda s: s.where(Property.city.contains(value))),
+    ('neighborhood', False, lambda value: lambda s: s.where(Property.neighborhood.contains(value))),
+    ('min_area', False, lambda value: lambda s: s.where(Property.area >= value)),
+    ('max_area', False, lambda value: lambda s: s.where(Property.area <= value)),
+    ('min_price', False, lambda value: lambda s: s.where(Property.price >= value)),
+    ('max_price', False, lambda value: lambda s: s.where(Property.price <= value)),
+    ('rooms', False, lambda value: lambda s: s.where(Property.rooms == value)),
+    ('parking', True, lambda value: lambda s: s.where(Property.parking == value)),
+    ('elevator', True, lambda value: lambda s: s.where(Property.elevator == value)),
+)
+
+
+def _is_sqlite_memory_url(database_url):
+    """
+    Check whether a SQLite URL points at an in-memory database
+    
+    Args:
+        database_url: Database connection URL
+    
+    Returns:
+        True for sqlite:// and :memory: URLs, including URI filenames with mode=memory
+    """
+    url = make_url(database_url)
+    return url.database in (None, '', ':memory:') or url.query.get('mode') == 'memory'
+
+
+def _insert_property_rows(connection, rows, batch_size):
+    """
+    Insert normalized property rows with Core executemany, batch_size rows per statement
+    Databases without ordered INSERT ... RETURNING (MySQL, SQLite before 3.35) get
+    one INSERT per row instead, reading each new primary key from the cursor
+    
+    Args:
+        connection: Connection to run the INSERTs on (its transaction is left open)
+        rows: Row dictionaries from _normalize_property_row
+        batch_size: Maximum number of rows sent per INSERT
+    
+    Returns:
+        IDs of the inserted rows, in the order of rows
+    """
+    if not connection.dialect.insert_executemany_returning_sort_by_parameter_order:
+        statement = insert(Property)
+        return [connection.execute(statement, row).inserted_primary_key[0] for row in rows]
+    
+    statement = insert(Property).returning(Property.id, sort_by_parameter_order=True)
+    property_ids = []
+    for start in range(0, len(rows), batch_size):
+        result = connection.execute(statement, rows[start:start + batch_size])
+        property_ids.extend(result.scalars())
+    return property_ids
 
 
 class DatabaseManager:
@@ -151,22 +356,110 @@ class DatabaseManager:
             database_url: Database connection URL (optional, uses config if not provided)
         """
         self.database_url = database_url or config.DATABASE_URL
-        self.engine = create_engine(self.database_url, echo=False)
-        self.Session = sessionmaker(bind=self.engine)
+        engine_options = {}
+        if not self.database_url.startswith('sqlite'):
+            # Server databases: keep enough pooled connections for concurrent handlers
+            engine_options.update(
+                pool_size=config.DATABASE_POOL_SIZE,
+                max_overflow=config.DATABASE_MAX_OVERFLOW,
+                pool_recycle=config.DATABASE_POOL_RECYCLE
+            )
+        elif _is_sqlite_memory_url(self.database_url):
+            # An in-memory database lives only as long as its connection: keep exactly one
+            # and share it between threads, so every session sees the same schema and rows
+            engine_options.update(
+                poolclass=StaticPool,
+                connect_args={'check_same_thread': False}
+            )
+        
+        # A larger compiled-statement cache keeps every search filter combination cached;
+        # pre-ping replaces connections the database server has dropped
+        self.engine = create_engine(
+            self.database_url, echo=False, query_cache_size=1200, pool_pre_ping=True, **engine_options
+        )
+        if self.engine.dialect.name == 'sqlite':
+            event.listen(self.engine, 'connect', _set_sqlite_pragmas)
+        
+        # One session per thread, reused across calls; objects stay loaded after commit
+        self.Session = scoped_session(sessionmaker(bind=self.engine, expire_on_commit=False))
         
         # Create all tables if they don't exist
         Base.metadata.create_all(self.engine)
+        # create_all skips existing tables, so add indexes introduced since a database was created
+        for index in Property.__table__.indexes:
+            index.create(self.engine, checkfirst=True)
+        
+        self.keyword_index_enabled = self._create_keyword_index()
+    
+    def _create_keyword_index(self):
+        """
+        Create the SQLite full-text keyword index if it does not exist yet
+        
+        Returns:
+            True if keyword searches can use the index; False for other databases
+            or SQLite builds without FTS5 trigram support (searches fall back to LIKE)
+        """
+        if self.engine.dialect.name != 'sqlite':
+            return False
+        
+        try:
+            with self.engine.begin() as connection:
+                exists = connection.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'properties_fts'")
+                ).first()
+                if not exists:
+                    for statement in _SQLITE_KEYWORD_INDEX_DDL:
+                        connection.execute(text(statement))
+            return True
+        except OperationalError:
+            return False
     
     def get_session(self):
         """
-        Get a new database session
+        Get the database session of the current thread
+        Callers still close() it when done, which returns its connection to the pool
         
         Returns:
             SQLAlchemy session object
         """
         return self.Session()
     
-    def add_property(self, user_id, property_data):
+    @contextmanager
+    def transaction(self, session=None):
+        """
+        Run several operations in one session and one transaction
+        Pass the yielded session to the CRUD methods (session=...) so they reuse its
+        connection; everything commits together when the block exits, or rolls back
+        if it raises
+        
+        Args:
+            session: Session of an enclosing transaction to join instead of starting one
+        
+        Yields:
+            SQLAlchemy session object
+        """
+        if session is not None:
+            yield session
+            return
+        
+        # A session of its own, not the thread's scoped one: CRUD calls made without
+        # session=... close that one, which would silently roll this transaction back
+        session = self.Session.session_factory()
+        try:
+            yield session
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
+    def close(self):
+        """Discard the thread's session and close all pooled connections"""
+        self.Session.remove()
+        self.engine.dispose()
+    
+    def add_property(self, user_id, property_data, session=None):
         """
         Add a new property to the database
         Creates a new property record with the provided information
@@ -174,78 +467,116 @@ class DatabaseManager:
         Args:
             user_id: Telegram user ID of the property owner
             property_data: Dictionary containing property information
-            
+            session: Session from transaction() to run in (default: own transaction)
+                        
         Returns:
             ID of the newly created property
             
         Raises:
             Exception if database operation fails
         """
+        return self.add_properties_bulk(user_id, [property_data], session=session)[0]
+    
+    def add_properties_bulk(self, user_id, property_data_list, batch_size=1000, session=None):
+        """
+        Add many properties for one user in a single transaction
+        Rows are inserted with Core executemany, batch_size rows per statement,
+        instead of building and flushing one ORM object per property
+        
+        Args:
+            user_id: Telegram user ID of the property owner
+            property_data_list: Dictionaries containing property information
+            batch_size: Maximum number of rows sent per INSERT (default: 1000)
+            session: Session from transaction() to run in (default: own transaction)
+        
+        Returns:
+            IDs of the newly created properties, in the order of property_data_list
+        
+        Raises:
+            Exception if database operation fails (nothing is inserted)
+        """
+        rows = [_normalize_property_row(user_id, property_data) for property_data in property_data_list]
+        if not rows:
+            return []
+        
+        if session is not None:
+            return _insert_property_rows(session.connection(), rows, batch_size)
+        
+        with self.engine.begin() as connection:
+            return _insert_property_rows(connection, rows, batch_size)
+    
+    def add_properties_mappings(self, user_id, property_data_list):
+        """
+        Add many properties for one user through the ORM bulk path
+        Uses Session.bulk_insert_mappings: rows go through the Property mapper but
+        no objects are built or tracked in the identity map
+        
+        Args:
+            user_id: Telegram user ID of the property owner
+            property_data_list: Dictionaries containing property information
+        
+        Returns:
+            Number of properties inserted
+        
+        Raises:
+            Exception if database operation fails (nothing is inserted)
+        """
+        rows = [_normalize_property_row(user_id, property_data) for property_data in property_data_list]
+        if not rows:
+            return 0
+        
         session = self.get_session()
         try:
-            property_obj = Property(
-                user_id=user_id,
-                title=property_data.get('title', 'Untitled Property'),
-                property_type=property_data.get('property_type', 'Apartment'),
-                city=property_data.get('city', ''),
-                neighborhood=property_data.get('neighborhood'),
-                address=property_data.get('address'),
-                area=float(property_data.get('area', 0)),
-                rooms=property_data.get('rooms'),
-                floor=property_data.get('floor'),
-                year_built=property_data.get('year_built'),
-                price=float(property_data.get('price', 0)),
-                parking=property_data.get('parking', False),
-                elevator=property_data.get('elevator', False),
-                storage=property_data.get('storage', False),
-                description=property_data.get('description')
-            )
-            session.add(property_obj)
+            session.bulk_insert_mappings(Property, rows)
             session.commit()
-            property_id = property_obj.id
-            return property_id
+            return len(rows)
         except Exception as e:
             session.rollback()
             raise e
         finally:
             session.close()
     
-    def get_property(self, property_id):
+    def get_property(self, property_id, session=None):
         """
         Get a property by its ID
         
         Args:
             property_id: ID of the property to retrieve
+            session: Session from transaction() to read through (default: own session)
             
         Returns:
             Property object or None if not found
         """
+        if session is not None:
+            return session.get(Property, property_id)
+        
         session = self.get_session()
         try:
-            return session.query(Property).filter(Property.id == property_id).first()
+            return session.get(Property, property_id)
         finally:
             session.close()
     
-    def get_user_properties(self, user_id, limit=50):
+    def get_user_properties(self, user_id, limit=50, stream=False):
         """
         Get all properties belonging to a specific user
         
         Args:
             user_id: Telegram user ID
             limit: Maximum number of properties to return (default: 50)
+            stream: Yield properties as they are fetched instead of returning a list
             
         Returns:
-            List of Property objects
+            List of Property objects (an iterator of them when stream is True)
         """
-        session = self.get_session()
-        try:
-            return session.query(Property).filter(
-                Property.user_id == user_id
-            ).order_by(Property.created_at.desc()).limit(limit).all()
-        finally:
-            session.close()
+        return self._fetch_properties(
+            select(Property)
+            .where(Property.user_id == user_id)
+            .order_by(Property.created_at.desc(), Property.id.desc())
+            .limit(limit),
+            stream
+        )
     
-    def search_properties(self, filters, limit=50):
+    def search_properties(self, filters, limit=50, offset=0, stream=False):
         """
         Search for properties based on filters
         Applies multiple filters to find matching properties
@@ -263,60 +594,145 @@ class DatabaseManager:
                 - parking: Parking required (boolean)
                 - elevator: Elevator required (boolean)
             limit: Maximum number of results (default: 50)
+            offset: Number of matching rows to skip (default: 0)
+            stream: Yield properties as they are fetched instead of returning a list
             
         Returns:
-            List of Property objects matching the filters
+            List of Property objects matching the filters (an iterator of them when stream is True)
+        """
+        statement = self._search_statement(lambda_stmt(lambda: select(Property)), filters, limit, offset)
+        return self._fetch_properties(statement, stream)
+    
+    def iter_search_properties(self, filters, batch_size=STREAM_BATCH_SIZE):
+        """
+        Iterate over every property matching the filters, without a result limit
+        Rows are fetched batch_size at a time, so memory stays flat for large result sets
+        
+        Args:
+            filters: Dictionary of search filters (same keys as search_properties)
+            batch_size: Number of rows fetched per batch (default: STREAM_BATCH_SIZE)
+        
+        Returns:
+            Iterator of Property objects, most recent first
         """
+        statement = self._search_statement(lambda_stmt(lambda: select(Property)), filters, None, 0)
+        return self._stream_properties(statement, batch_size)
+    
+    def search_properties_text(self, filters, limit=50, offset=0):
+        """
+        Search for properties and return them already formatted for display
+        Selects only the displayed columns, so no Property objects are built
+        
+        Args:
+            filters: Dictionary of search filters (same keys as search_properties)
+            limit: Maximum number of results (default: 50)
+            offset: Number of matching rows to skip (default: 0)
+        
+        Returns:
+            List of (property ID, formatted text) tuples, most recent first
+        """
+        statement = self._search_statement(lambda_stmt(lambda: select(*PROPERTY_TEXT_COLUMNS)), filters, limit, offset)
         session = self.get_session()
         try:
-            query = session.query(Property)
-            
-            # Limit to a specific user if requested
-            if filters.get('user_id'):
-                query = query.filter(Property.user_id == filters['user_id'])
-
-            # Apply property type filter
-            if filters.get('property_type'):
-                query = query.filter(Property.property_type.contains(filters['property_type']))
-            
-            # Apply location filters
-            if filters.get('city'):
-                query = query.filter(Property.city.contains(filters['city']))
-            
-            if filters.get('neighborhood'):
-                query = query.filter(Property.neighborhood.contains(filters['neighborhood']))
-            
-            # Apply area range filters
-            if filters.get('min_area'):
-                query = query.filter(Property.area >= filters['min_area'])
-            
-            if filters.get('max_area'):
-                query = query.filter(Property.area <= filters['max_area'])
-            
-            # Apply price range filters
-            if filters.get('min_price'):
-                query = query.filter(Property.price >= filters['min_price'])
-            
-            if filters.get('max_price'):
-                query = query.filter(Property.price <= filters['max_price'])
-            
-            # Apply bedroom count filter
-            if filters.get('rooms'):
-                query = query.filter(Property.rooms == filters['rooms'])
-            
-            # Apply amenity filters
-            if filters.get('parking') is not None:
-                query = query.filter(Property.parking == filters['parking'])
-            
-            if filters.get('elevator') is not None:
-                query = query.filter(Property.elevator == filters['elevator'])
-            
-            # Return results ordered by most recent first
-            return query.order_by(Property.created_at.desc()).limit(limit).all()
+            rows = session.execute(statement)
+            return [(row.id, render_property_text(row)) for row in rows]
         finally:
             session.close()
     
-    def filter_by_keywords(self, keywords, limit=50):
+    def search_properties_dicts(self, filters, limit=50, offset=0):
+        """
+        Search for properties and return them as dictionaries for serialization
+        Reads plain row mappings of the properties table instead of Property objects
+        
+        Args:
+            filters: Dictionary of search filters (same keys as search_properties)
+            limit: Maximum number of results (default: 50)
+            offset: Number of matching rows to skip (default: 0)
+        
+        Returns:
+            List of dictionaries shaped like Property.to_dict, most recent first
+        """
+        statement = self._search_statement(lambda_stmt(lambda: select(Property.__table__)), filters, limit, offset)
+        session = self.get_session()
+        try:
+            return rows_to_dicts(session.execute(statement).mappings())
+        finally:
+            session.close()
+    
+    def get_properties_text(self, property_ids):
+        """
+        Get formatted display text for specific properties
+        
+        Args:
+            property_ids: IDs of the properties to render
+        
+        Returns:
+            List of (property ID, formatted text) tuples in the order of property_ids,
+            skipping properties that no longer exist
+        """
+        if not property_ids:
+            return []
+        
+        session = self.get_session()
+        try:
+            rows = session.execute(
+                select(*PROPERTY_TEXT_COLUMNS).where(Property.id.in_(property_ids))
+            )
+            texts = {row.id: render_property_text(row) for row in rows}
+            return [(property_id, texts[property_id]) for property_id in property_ids if property_id in texts]
+        finally:
+            session.close()
+    
+    def _search_statement(self, statement, filters, limit, offset):
+        """
+        Add the search filters, ordering and paging to a lambda statement
+        Makes a single pass over _SEARCH_FILTERS, reading each filter value once
+        
+        Args:
+            statement: lambda_stmt selecting the wanted columns from Property
+            filters: Dictionary of search filters (see search_properties)
+            limit: Maximum number of results (None for all matches)
+            offset: Number of matching rows to skip
+        
+        Returns:
+            StatementLambdaElement ready to execute
+        """
+        for key, match_false, where in _SEARCH_FILTERS:
+            value = filters.get(key)
+            if value or (match_false and value is not None):
+                statement += where(value)
+        
+        # Most recent first (a None LIMIT cannot be bound, so unlimited searches get their own step)
+        if limit is None:
+            statement += lambda s: s.order_by(Property.created_at.desc(), Property.id.desc()).offset(offset)
+        else:
+            statement += lambda s: s.order_by(Property.created_at.desc(), Property.id.desc()).limit(limit).offset(offset)
+        return statement
+    
+    def list_user_properties(self, user_id, limit=50):
+        """
+        Get a short overview of a user's properties
+        Selects only the columns a list view needs, so no Property objects are built
+        
+        Args:
+            user_id: Telegram user ID
+            limit: Maximum number of properties to return (default: 50)
+        
+        Returns:
+            List of rows with id, title, city, price, area, and property_type, most recent first
+        """
+        session = self.get_session()
+        try:
+            return session.execute(
+                select(*PROPERTY_LIST_COLUMNS)
+                .where(Property.user_id == user_id)
+                .order_by(Property.created_at.desc(), Property.id.desc())
+                .limit(limit)
+            ).all()
+        finally:
+            session.close()
+    
+    def filter_by_keywords(self, keywords, limit=50, stream=False):
         """
         Filter properties by keywords
         Searches through title, description, address, and other text fields
@@ -324,29 +740,62 @@ class DatabaseManager:
         Args:
             keywords: Search keywords (string)
             limit: Maximum number of results (default: 50)
+            stream: Yield properties as they are fetched instead of returning a list
             
         Returns:
-            List of Property objects containing the keywords
+            List of Property objects containing the keywords (an iterator of them when stream is True)
+        """
+        if self.keyword_index_enabled and len(keywords) >= KEYWORD_INDEX_MIN_LENGTH:
+            # Quoted as one FTS phrase, so the whole string is matched as a substring
+            pattern = '"{}"'.format(keywords.replace('"', '""'))
+            search_filter = Property.id.in_(_KEYWORD_INDEX_QUERY.bindparams(pattern=pattern))
+        else:
+            # Search in multiple text fields using OR condition
+            search_filter = or_(*(
+                getattr(Property, name).contains(keywords) for name in KEYWORD_SEARCH_COLUMNS
+            ))
+        
+        return self._fetch_properties(
+            select(Property)
+            .where(search_filter)
+            .order_by(Property.created_at.desc(), Property.id.desc())
+            .limit(limit),
+            stream
+        )
+    
+    def _fetch_properties(self, statement, stream=False):
+        """
+        Run a statement selecting Property objects
+        
+        Args:
+            statement: select(Property) statement
+            stream: Return an iterator that fetches rows in batches instead of a list
+        
+        Returns:
+            List (or iterator) of Property objects
         """
+        if stream:
+            return self._stream_properties(statement)
+        
         session = self.get_session()
         try:
-            # Search in multiple text fields using OR condition
-            search_filter = or_(
-                Property.title.contains(keywords),
-                Property.description.contains(keywords),
-                Property.address.contains(keywords),
-                Property.property_type.contains(keywords),
-                Property.city.contains(keywords),
-                Property.neighborhood.contains(keywords)
-            )
-            
-            return session.query(Property).filter(
-                search_filter
-            ).order_by(Property.created_at.desc()).limit(limit).all()
+            return session.scalars(statement).all()
         finally:
             session.close()
     
-    def update_property(self, property_id, updates):
+    def _stream_properties(self, statement, batch_size=STREAM_BATCH_SIZE):
+        """
+        Yield Property objects batch_size rows at a time (server-side cursor where supported)
+        Uses its own session, since the thread's shared session may be closed by
+        other calls while the caller is still iterating
+        """
+        session = self.Session.session_factory()
+        try:
+            yield from session.scalars(statement, execution_options={'yield_per': batch_size})
+        finally:
+            session.close()
+    
+    def update_property(self, property_id, updates, session=None):
         """
         Update property information
         Updates only the specified fields, keeps other data unchanged
@@ -354,6 +803,7 @@ class DatabaseManager:
         Args:
             property_id: ID of the property to update
             updates: Dictionary of fields to update
+            session: Session from transaction() to run in (default: own transaction)
             
         Returns:
             True if successful, False if property not found
@@ -361,27 +811,19 @@ class DatabaseManager:
         Raises:
             Exception if database operation fails
         """
-        session = self.get_session()
-        try:
-            property_obj = session.query(Property).filter(Property.id == property_id).first()
+        with self.transaction(session) as session:
+            property_obj = session.get(Property, property_id)
             if property_obj:
                 # Update each specified field
                 for key, value in updates.items():
                     if hasattr(property_obj, key):
                         setattr(property_obj, key, value)
                 
-                # Update timestamp
-                property_obj.updated_at = datetime.now()
-                session.commit()
+                session.flush()
                 return True
             return False
-        except Exception as e:
-            session.rollback()
-            raise e
-        finally:
-            session.close()
     
-    def delete_property(self, property_id, user_id=None):
+    def delete_property(self, property_id, user_id=None, session=None):
         """
         Delete a property from the database
         Optionally verify ownership by checking user_id
@@ -389,32 +831,26 @@ class DatabaseManager:
         Args:
             property_id: ID of the property to delete
             user_id: Optional user ID to verify ownership
-            
+            session: Session from transaction() to run in (default: own transaction)
+                        
         Returns:
             True if successful, False if property not found or ownership mismatch
             
         Raises:
             Exception if database operation fails
         """
-        session = self.get_session()
-        try:
-            query = session.query(Property).filter(Property.id == property_id)
+        with self.transaction(session) as session:
+            property_obj = session.get(Property, property_id)
             
-            # If user_id provided, verify ownership
-            if user_id:
-                query = query.filter(Property.user_id == user_id)
+            # If user_id provided, verify ownership on the loaded row
+            if user_id and property_obj and property_obj.user_id != user_id:
+                property_obj = None
             
-            property_obj = query.first()
             if property_obj:
                 session.delete(property_obj)
-                session.commit()
+                session.flush()
                 return True
             return False
-        except Exception as e:
-            session.rollback()
-            raise e
-        finally:
-            session.close()
     
     def get_statistics(self):
         """
@@ -429,21 +865,20 @@ class DatabaseManager:
         """
         session = self.get_session()
         try:
-            # Count total properties
-            total_properties = session.query(Property).count()
-            
-            # Calculate average price
-            avg_price = session.query(Property.price).filter(Property.price > 0).all()
-            avg_price_value = sum([p[0] for p in avg_price]) / len(avg_price) if avg_price else 0
-            
-            # Calculate average area
-            avg_area = session.query(Property.area).filter(Property.area > 0).all()
-            avg_area_value = sum([a[0] for a in avg_area]) / len(avg_area) if avg_area else 0
+            # Count and average in one statement; CASE leaves out non-positive
+            # prices/areas (NULL is ignored by AVG)
+            total_properties, avg_price, avg_area = session.execute(
+                select(
+                    func.count(Property.id),
+                    func.avg(case((Property.price > 0, Property.price))),
+                    func.avg(case((Property.area > 0, Property.area)))
+                )
+            ).one()
             
             return {
                 'total_properties': total_properties,
-                'average_price': avg_price_value,
-                'average_area': avg_area_value
+                'average_price': avg_price or 0,
+                'average_area': avg_area or 0
             }
         finally:
             session.close()
@@ -1,13 +1,108 @@
 """
 AI Handler for Real Estate Bot (OpenAI GPT-based)
 """
+import hashlib
 import json
-import re
 import logging
+import time
+from collections import OrderedDict
 
 import openai
 
 import config
+from openai_session import use_session
+
+_JSON_DECODER = json.JSONDecoder()
+
+# Field groups used when cleaning extracted data
+_PROPERTY_FLOAT_FIELDS = frozenset(('area', 'price'))
+_PROPERTY_INT_FIELDS = frozenset(('rooms', 'floor', 'year_built'))
+_PROPERTY_BOOL_FIELDS = frozenset(('parking', 'elevator', 'storage'))
+_FILTER_FLOAT_FIELDS = frozenset(('min_area', 'max_area', 'min_price', 'max_price'))
+_FILTER_INT_FIELDS = frozenset(('rooms',))
+_FILTER_BOOL_FIELDS = frozenset(('parking', 'elevator'))
+
+# Strings the model uses to say an amenity is present / required
+_TRUTHY_PROPERTY = frozenset(('true', 'yes', '1', 'has', 'available'))
+_TRUTHY_FILTER = frozenset(('true', 'yes', '1', 'required', 'needed'))
+
+# Display names for fields the user still has to provide
+_FIELD_NAMES = {
+    'title': 'Property title',
+    'property_type': 'Property type (apartment, house, villa, etc.)',
+    'city': 'City',
+    'neighborhood': 'Neighborhood',
+    'address': 'Address',
+    'area': 'Size/Area',
+    'price': 'Price',
+    'rooms': 'Number of bedrooms',
+    'floor': 'Floor number',
+    'year_built': 'Year built'
+}
+
+
+# Field converters: each returns the cleaned value, or None to drop the field
+def _to_float(value):
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _to_str(value):
+    return str(value).strip()
+
+
+def _bool_converter(truthy_values):
+    def to_bool(value):
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            return value.lower() in truthy_values
+        return None
+    return to_bool
+
+
+_PROPERTY_CONVERTERS = {
+    **dict.fromkeys(_PROPERTY_FLOAT_FIELDS, _to_float),
+    **dict.fromkeys(_PROPERTY_INT_FIELDS, _to_int),
+    **dict.fromkeys(_PROPERTY_BOOL_FIELDS, _bool_converter(_TRUTHY_PROPERTY)),
+}
+_FILTER_CONVERTERS = {
+    **dict.fromkeys(_FILTER_FLOAT_FIELDS, _to_float),
+    **dict.fromkeys(_FILTER_INT_FIELDS, _to_int),
+    **dict.fromkeys(_FILTER_BOOL_FIELDS, _bool_converter(_TRUTHY_FILTER)),
+}
+
+
+def _clean_fields(data, converters):
+    """Convert each field with its converter (text by default), dropping empty or invalid values."""
+    cleaned = {}
+    for key, value in data.items():
+        if value is None or value == 'null' or value == '':
+            continue
+
+        converted = converters.get(key, _to_str)(value)
+        if converted is not None:
+            cleaned[key] = converted
+
+    return cleaned
+
+
+def _parse_json_object(text):
+    """Decode the first JSON object in a model reply, or return None if there is none."""
+    start = text.find('{')
+    if start == -1:
+        return None
+    # raw_decode stops at the end of the object, so any trailing prose is ignored
+    return _JSON_DECODER.raw_decode(text, start)[0]
 
 
 class GptHandler:
@@ -22,44 +117,65 @@ class GptHandler:
 
         openai.api_key = config.OPENAI_API_KEY
         self.model = config.OPENAI_MODEL
+        self.fast_model = config.OPENAI_FAST_MODEL or None
+        # Models that rejected response_format; they get plain requests from then on
+        self._json_mode_unsupported = set()
+        # Extraction replies keyed by a hash of model + normalized prompt:
+        # key -> (expiry time, reply), least recently used first
+        self._response_cache = OrderedDict()
         openai.api_base = ""
 
-    def extract_property_info(self, user_text):
+    async def extract_property_info(self, user_text):
+        if self._use_fast_model(user_text):
+            property_data = await self._extract_property_info(user_text, self.fast_model)
+            # Short messages are often partial edits, so any extracted field is kept
+            if property_data:
+                return property_data
+
+        return await self._extract_property_info(user_text)
+
+    async def _extract_property_info(self, user_text, model=None):
         try:
             prompt = f"{config.PROPERTY_EXTRACTION_PROMPT}\n\nUser's text:\n{user_text}"
-            result_text = self._chat(prompt).strip()
+            result_text = (await self._chat(prompt, model, json_mode=True)).strip()
 
-            json_match = re.search(r'\{[\s\S]*\}', result_text)
-            if json_match:
-                property_data = json.loads(json_match.group(0))
+            property_data = _parse_json_object(result_text)
+            if property_data is not None:
                 return self._clean_property_data(property_data)
             return None
         except Exception as exc:
             logging.error("Error extracting property information: %s", exc)
             return None
 
-    def extract_search_filters(self, user_text):
+    async def extract_search_filters(self, user_text):
+        if self._use_fast_model(user_text):
+            filters = await self._extract_search_filters(user_text, self.fast_model)
+            if filters:
+                return filters
+
+        return await self._extract_search_filters(user_text)
+
+    async def _extract_search_filters(self, user_text, model=None):
         try:
             prompt = f"{config.SEARCH_QUERY_PROMPT}\n\nUser's request:\n{user_text}"
-            result_text = self._chat(prompt).strip()
+            result_text = (await self._chat(prompt, model, json_mode=True)).strip()
 
-            json_match = re.search(r'\{[\s\S]*\}', result_text)
-            if json_match:
-                filters = json.loads(json_match.group(0))
+            filters = _parse_json_object(result_text)
+            if filters is not None:
                 return self._clean_filters(filters)
             return {}
         except Exception as exc:
             logging.error("Error extracting search filters: %s", exc)
             return {}
 
-    def generate_response(self, prompt, context=None):
+    async def generate_response(self, prompt, context=None):
         try:
             if context:
                 full_prompt = f"{context}\n\n{prompt}"
             else:
                 full_prompt = prompt
 
-            return self._chat(full_prompt).strip()
+            return (await self._chat(full_prompt)).strip()
         except Exception as exc:
             logging.error("Error generating response: %s", exc)
             return "I couldn't generate an appropriate response."
@@ -71,27 +187,8 @@ class GptHandler:
         return is_valid, missing_fields, property_data
 
     def ask_for_missing_info(self, missing_fields):
-        field_names = {
-            'title': 'Property title',
-            'property_type': 'Property type (apartment, house, villa, etc.)',
-            'city': 'City',
-            'neighborhood': 'Neighborhood',
-            'address': 'Address',
-            'area': 'Size/Area',
-            'price': 'Price',
-            'rooms': 'Number of bedrooms',
-            'floor': 'Floor number',
-            'year_built': 'Year built'
-        }
-        
-        missing_names = [field_names.get(f, f) for f in missing_fields]
-
-        message = "⚠️ The following information is missing:\n\n"
-        for name in missing_names:
-            message += f"• {name}\n"
-
-        message += "\nPlease provide the complete information."
-        return message
+        lines = ''.join(f"• {_FIELD_NAMES.get(f, f)}\n" for f in missing_fields)
+        return f"⚠️ The following information is missing:\n\n{lines}\nPlease provide the complete information."
 
     def summarize_properties(self, properties):
         if not properties:
@@ -103,58 +200,12 @@ class GptHandler:
         return f"Found {count} properties matching your search."
 
     def _clean_property_data(self, data):
-        cleaned = {}
-        for key, value in data.items():
-            if value is None or value == 'null' or value == '':
-                continue
-
-            if key in ['area', 'price']:
-                try:
-                    cleaned[key] = float(value)
-                except (ValueError, TypeError):
-                    continue
-            elif key in ['rooms', 'floor', 'year_built']:
-                try:
-                    cleaned[key] = int(value)
-                except (ValueError, TypeError):
-                    continue
-            elif key in ['parking', 'elevator', 'storage']:
-                if isinstance(value, bool):
-                    cleaned[key] = value
-                elif isinstance(value, str):
-                    cleaned[key] = value.lower() in ['true', 'yes', '1', 'has', 'available']
-            else:
-                cleaned[key] = str(value).strip()
-
-        return cleaned
+        return _clean_fields(data, _PROPERTY_CONVERTERS)
 
     def _clean_filters(self, filters):
-        cleaned = {}
-        for key, value in filters.items():
-            if value is None or value == 'null' or value == '':
-                continue
-
-            if key in ['min_area', 'max_area', 'min_price', 'max_price']:
-                try:
-                    cleaned[key] = float(value)
-                except (ValueError, TypeError):
-                    continue
-            elif key == 'rooms':
-                try:
-                    cleaned[key] = int(value)
-                except (ValueError, TypeError):
-                    continue
-            elif key in ['parking', 'elevator']:
-                if isinstance(value, bool):
-                    cleaned[key] = value
-                elif isinstance(value, str):
-                    cleaned[key] = value.lower() in ['true', 'yes', '1', 'required', 'needed']
-            else:
-                cleaned[key] = str(value).strip()
+        return _clean_fields(filters, _FILTER_CONVERTERS)
 
-        return cleaned
-
-    def chat_response(self, user_message, conversation_context=""):
+    async def chat_response(self, user_message, conversation_context=""):
         system_prompt = """
 You are an intelligent real estate assistant that responds in English.
 Your job is to help users manage property information.
@@ -168,22 +219,88 @@ Your responses should be polite, helpful, and in simple language.
 
         full_prompt += f"User's message:\n{user_message}\n\nResponse:"
 
-        return self.generate_response(full_prompt)
+        return await self.generate_response(full_prompt)
 
-    def _chat(self, prompt):
+    def _use_fast_model(self, user_text):
+        """
+        Return True if a short request should be tried on the fast model first.
         """
-        Helper to call OpenAI ChatCompletion API.
+        return bool(self.fast_model) and len(user_text) <= config.FAST_EXTRACTION_MAX_CHARS
+
+    def _response_cache_key(self, model, prompt):
         """
+        Hash model + prompt, ignoring case and whitespace differences.
+        """
+        normalized = " ".join(prompt.lower().split())
+        return hashlib.sha256(f"{model}\n{normalized}".encode("utf-8")).hexdigest()
+
+    def _get_cached_response(self, key):
+        """
+        Return a cached reply that has not expired, or None.
+        """
+        entry = self._response_cache.get(key)
+        if entry is None:
+            return None
+
+        expires_at, reply = entry
+        if expires_at < time.monotonic():
+            del self._response_cache[key]
+            return None
+
+        self._response_cache.move_to_end(key)
+        return reply
+
+    def _cache_response(self, key, reply):
+        """
+        Store a reply, evicting the least recently used entry when the cache is full.
+        """
+        self._response_cache[key] = (time.monotonic() + config.OPENAI_RESPONSE_CACHE_TTL, reply)
+        self._response_cache.move_to_end(key)
+        if len(self._response_cache) > config.OPENAI_RESPONSE_CACHE_SIZE:
+            self._response_cache.popitem(last=False)
+
+    async def _chat(self, prompt, model=None, json_mode=False):
+        """
+        Helper to call OpenAI ChatCompletion API without blocking the event loop.
+        With json_mode the model is asked for a strict JSON object (the prompt must mention JSON);
+        models without JSON mode support fall back to a plain request.
+        JSON mode calls are deterministic (temperature 0), so their replies are cached.
+        """
+        model = model or self.model
+        cache_key = None
+        if json_mode and config.OPENAI_RESPONSE_CACHE_SIZE > 0:
+            cache_key = self._response_cache_key(model, prompt)
+            cached = self._get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+
+        request = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": "You are a helpful assistant."},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": 0 if json_mode else 0.2,
+        }
+        if json_mode and model not in self._json_mode_unsupported:
+            request["response_format"] = {"type": "json_object"}
+
+        use_session()
         try:
-            response = openai.ChatCompletion.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.2,
-            )
-            return response["choices"][0]["message"]["content"]
+            try:
+                response = await openai.ChatCompletion.acreate(**request)
+            except openai.error.InvalidRequestError as exc:
+                if "response_format" not in request or "response_format" not in str(exc):
+                    raise
+                logging.warning("Model %s does not support JSON mode; using plain requests", model)
+                self._json_mode_unsupported.add(model)
+                del request["response_format"]
+                response = await openai.ChatCompletion.acreate(**request)
+            reply = response["choices"][0]["message"]["content"]
         except Exception as exc:
             logging.error("Error calling OpenAI API: %s", exc)
             raise
+
+        if cache_key is not None and reply:
+            self._cache_response(cache_key, reply)
+        return reply
@@ -0,0 +1,30 @@
+"""
+Shared HTTP session for OpenAI API calls
+GptHandler and VoiceHandler send their requests through one aiohttp session,
+so the bot keeps a single connection pool to the API host.
+"""
+import aiohttp
+import openai
+
+_aiosession = None
+
+
+def use_session():
+    """
+    Make the OpenAI client send this task's requests through the shared HTTP session.
+    The session is created on first use, inside the running event loop.
+    """
+    global _aiosession
+    if _aiosession is None or _aiosession.closed:
+        _aiosession = aiohttp.ClientSession()
+    openai.aiosession.set(_aiosession)
+
+
+async def close_session():
+    """
+    Close the shared HTTP session.
+    """
+    global _aiosession
+    if _aiosession is not None:
+        await _aiosession.close()
+        _aiosession = None
@@ -2,10 +2,15 @@
 Component Test Script for Real Estate Bot
 Tests core functionality without requiring Telegram connection
 Run this to verify basic setup and components
+Pass --config-only to check the configuration alone, without importing
+the database, OpenAI or voice modules
 """
+import asyncio
 import sys
 import os
 
+CONFIG_ONLY = '--config-only' in sys.argv[1:]
+
 print("=" * 60)
 print("Real Estate Bot - Component Test Suite")
 print("=" * 60)
@@ -37,6 +42,10 @@ except Exception as e:
 
 print()
 
+if CONFIG_ONLY:
+    print("Configuration check complete (--config-only: component tests skipped)")
+    sys.exit(0)
+
 # Test 2: Database Connection
 print("[Test 2] Testing database connection...")
 try:
@@ -74,7 +83,14 @@ try:
     if config.OPENAI_API_KEY and config.OPENAI_API_KEY != 'your-openai-api-key-here':
         print("✅ Testing AI extraction...")
         test_text = "A 100 square meter apartment in New York, 2 bedrooms, price $400,000"
-        result = ai_handler.extract_property_info(test_text)
+        
+        async def run_extraction():
+            try:
+                return await ai_handler.extract_property_info(test_text)
+            finally:
+                await ai_handler.close()
+        
+        result = asyncio.run(run_extraction())
         
         if result and isinstance(result, dict):
             print("✅ Property extraction successful")
@@ -126,25 +142,26 @@ try:
         'description': 'This is a test property'
     }
     
-    # Add property
+    # Add, retrieve and update in one transaction (one connection, one commit)
     test_user_id = 999999999  # Test user ID
-    prop_id = db.add_property(test_user_id, test_property_data)
-    print(f"✅ Created test property (ID: {prop_id})")
-    
-    # Retrieve property
-    prop = db.get_property(prop_id)
-    if prop and prop.title == 'Test Apartment':
-        print("✅ Retrieved property successfully")
-    else:
-        print("❌ Failed to retrieve property")
-    
-    # Update property
-    updates = {'price': 350000.0}
-    success = db.update_property(prop_id, updates)
-    if success:
-        print("✅ Updated property successfully")
-    else:
-        print("❌ Failed to update property")
+    with db.transaction() as session:
+        prop_id = db.add_property(test_user_id, test_property_data, session=session)
+        print(f"✅ Created test property (ID: {prop_id})")
+        
+        # Retrieve property
+        prop = db.get_property(prop_id, session=session)
+        if prop and prop.title == 'Test Apartment':
+            print("✅ Retrieved property successfully")
+        else:
+            print("❌ Failed to retrieve property")
+        
+        # Update property
+        updates = {'price': 350000.0}
+        success = db.update_property(prop_id, updates, session=session)
+        if success:
+            print("✅ Updated property successfully")
+        else:
+            print("❌ Failed to update property")
     
     # Search properties
     filters = {'city': 'Test City'}
@@ -158,19 +175,20 @@ try:
     keyword_results = db.filter_by_keywords('test')
     print(f"✅ Keyword filter successful (found {len(keyword_results)} properties)")
     
-    # Delete test property
-    success = db.delete_property(prop_id, test_user_id)
-    if success:
-        print("✅ Deleted test property successfully")
-    else:
-        print("❌ Failed to delete test property")
-    
-    # Verify deletion
-    prop = db.get_property(prop_id)
-    if prop is None:
-        print("✅ Confirmed property deletion")
-    else:
-        print("⚠️  Property still exists after deletion")
+    # Delete test property and verify in a second transaction
+    with db.transaction() as session:
+        success = db.delete_property(prop_id, test_user_id, session=session)
+        if success:
+            print("✅ Deleted test property successfully")
+        else:
+            print("❌ Failed to delete test property")
+        
+        # Verify deletion
+        prop = db.get_property(prop_id, session=session)
+        if prop is None:
+            print("✅ Confirmed property deletion")
+        else:
+            print("⚠️  Property still exists after deletion")
     
 except Exception as e:
     print(f"❌ Database operations test failed: {e}")
@@ -1,12 +1,12 @@
 """
 Unit tests for database.py
 """
-import unittest
-import sys
 import os
+import tempfile
+import unittest
+from unittest import mock
 
-# Add project root to Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from sqlalchemy import create_engine, delete, text
 
 from database import DatabaseManager, Property
 
@@ -14,10 +14,23 @@ from database import DatabaseManager, Property
 class TestDatabaseManager(unittest.TestCase):
     """Tests for DatabaseManager"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one in-memory database (engine and schema) for all tests"""
+        cls.db = DatabaseManager('sqlite:///:memory:')
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Close the shared database"""
+        cls.db.close()
+    
+    def tearDown(self):
+        """Remove the rows a test added, so every test starts from an empty table"""
+        with self.db.transaction() as session:
+            session.execute(delete(Property))
+    
     def setUp(self):
-        """Create a fresh in-memory database before each test"""
-        self.db = DatabaseManager('sqlite:///:memory:')
-        
+        """Prepare the sample property data"""
         # Sample property data
         self.sample_property = {
             'title': 'Sample Apartment',
@@ -42,6 +55,49 @@ class TestDatabaseManager(unittest.TestCase):
         self.assertIsNotNone(property_id)
         self.assertIsInstance(property_id, int)
     
+    def test_add_properties_bulk(self):
+        """Bulk insert should return IDs in input order, batching as needed"""
+        properties = []
+        for index in range(5):
+            property_data = self.sample_property.copy()
+            property_data['title'] = f'Property {index}'
+            properties.append(property_data)
+        
+        property_ids = self.db.add_properties_bulk(123456, properties, batch_size=2)
+        
+        self.assertEqual(len(property_ids), 5)
+        self.assertEqual(
+            [self.db.get_property(property_id).title for property_id in property_ids],
+            [f'Property {index}' for index in range(5)]
+        )
+        self.assertIsNotNone(self.db.get_property(property_ids[0]).created_at)
+        self.assertEqual(self.db.add_properties_bulk(123456, []), [])
+    
+    def test_add_properties_bulk_without_returning(self):
+        """Databases without INSERT ... RETURNING should still get IDs back in order"""
+        dialect = self.db.engine.dialect
+        with mock.patch.object(dialect, 'insert_executemany_returning_sort_by_parameter_order', False), \
+                mock.patch.object(dialect, 'insert_returning', False):
+            property_ids = self.db.add_properties_bulk(123456, [
+                {**self.sample_property, 'title': f'Apartment {number}'} for number in range(3)
+            ])
+            single_id = self.db.add_property(123456, self.sample_property)
+        
+        self.assertEqual(
+            [self.db.get_property(property_id).title for property_id in property_ids],
+            ['Apartment 0', 'Apartment 1', 'Apartment 2']
+        )
+        self.assertEqual(self.db.get_property(single_id).title, 'Sample Apartment')
+    
+    def test_add_properties_mappings(self):
+        """ORM bulk insert should store every row with timestamps"""
+        count = self.db.add_properties_mappings(123456, [self.sample_property, self.sample_property])
+        
+        properties = self.db.get_user_properties(123456)
+        self.assertEqual(count, 2)
+        self.assertEqual(len(properties), 2)
+        self.assertTrue(all(prop.created_at and prop.updated_at for prop in properties))
+    
     def test_get_property(self):
         """Verify a stored property can be retrieved"""
         property_id = self.db.add_property(123456, self.sample_property)
@@ -66,6 +122,19 @@ class TestDatabaseManager(unittest.TestCase):
         
         self.assertEqual(len(properties), 2)
     
+    def test_list_user_properties(self):
+        """List rows should carry only the overview columns"""
+        property_id = self.db.add_property(123456, self.sample_property)
+        
+        rows = self.db.list_user_properties(123456)
+        
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0].id, property_id)
+        self.assertEqual(rows[0].title, 'Sample Apartment')
+        self.assertEqual(rows[0].price, 5_000_000_000)
+        self.assertFalse(hasattr(rows[0], 'description'))
+        self.assertEqual(self.db.list_user_properties(999), [])
+    
     def test_search_properties(self):
         """Search should respect filters"""
         self.db.add_property(123456, self.sample_property)
@@ -86,6 +155,51 @@ class TestDatabaseManager(unittest.TestCase):
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0].price, 3_000_000_000)
     
+    def test_search_properties_stream(self):
+        """Streaming should yield the same properties as the list result"""
+        for _ in range(3):
+            self.db.add_property(123456, self.sample_property)
+        
+        streamed = self.db.search_properties({'city': 'Tehran'}, stream=True)
+        
+        self.assertNotIsInstance(streamed, list)
+        self.assertEqual(
+            [prop.id for prop in streamed],
+            [prop.id for prop in self.db.search_properties({'city': 'Tehran'})]
+        )
+    
+    def test_iter_search_properties(self):
+        """Iterating should return every match, past the default limit, in small batches"""
+        property_ids = self.db.add_properties_bulk(123456, [self.sample_property] * 60)
+        
+        streamed = self.db.iter_search_properties({'city': 'Tehran'}, batch_size=25)
+        
+        self.assertEqual([prop.id for prop in streamed], property_ids[::-1])
+    
+    def test_search_properties_limit_offset(self):
+        """Search should page through results with limit and offset"""
+        for _ in range(3):
+            self.db.add_property(123456, self.sample_property)
+        
+        self.assertEqual(len(self.db.search_properties({}, limit=2)), 2)
+        self.assertEqual(len(self.db.search_properties({}, limit=2, offset=2)), 1)
+        self.assertEqual(self.db.search_properties({}, limit=2, offset=3), [])
+    
+    def test_filter_by_keywords(self):
+        """Keyword search should match substrings case-insensitively and follow updates"""
+        property_id = self.db.add_property(123456, self.sample_property)
+        
+        self.assertEqual([prop.id for prop in self.db.filter_by_keywords('MODERN apart')], [property_id])
+        self.assertEqual([prop.id for prop in self.db.filter_by_keywords('Va')], [property_id])
+        self.assertEqual(self.db.filter_by_keywords('villa'), [])
+        
+        self.db.update_property(property_id, {'description': 'Quiet villa'})
+        self.assertEqual([prop.id for prop in self.db.filter_by_keywords('villa')], [property_id])
+        self.assertEqual(self.db.filter_by_keywords('modern'), [])
+        
+        self.db.delete_property(property_id)
+        self.assertEqual(self.db.filter_by_keywords('villa'), [])
+    
     def test_update_property(self):
         """Updates should persist"""
         property_id = self.db.add_property(123456, self.sample_property)
@@ -110,6 +224,68 @@ class TestDatabaseManager(unittest.TestCase):
         property_obj = self.db.get_property(property_id)
         self.assertIsNone(property_obj)
     
+    def test_transaction(self):
+        """Operations in one transaction should commit together"""
+        with self.db.transaction() as session:
+            property_id = self.db.add_property(123456, self.sample_property, session=session)
+            self.assertTrue(self.db.update_property(property_id, {'rooms': 4}, session=session))
+            property_obj = self.db.get_property(property_id, session=session)
+        
+        self.assertEqual(property_obj.rooms, 4)
+        self.assertEqual(self.db.get_property(property_id).rooms, 4)
+    
+    def test_timestamps_without_server_default(self):
+        """Tables created before the server defaults existed should still get timestamps"""
+        with tempfile.TemporaryDirectory() as directory:
+            url = 'sqlite:///' + os.path.join(directory, 'legacy.db')
+            engine = create_engine(url)
+            with engine.begin() as connection:
+                connection.execute(text(
+                    'CREATE TABLE properties (id INTEGER PRIMARY KEY, user_id INTEGER NOT NULL, '
+                    'title VARCHAR(200) NOT NULL, property_type VARCHAR(50) NOT NULL, '
+                    'city VARCHAR(100) NOT NULL, neighborhood VARCHAR(100), address TEXT, '
+                    'area FLOAT NOT NULL, rooms INTEGER, floor INTEGER, year_built INTEGER, '
+                    'price FLOAT NOT NULL, parking BOOLEAN, elevator BOOLEAN, storage BOOLEAN, '
+                    'description TEXT, created_at DATETIME, updated_at DATETIME)'
+                ))
+            engine.dispose()
+            
+            db = DatabaseManager(url)
+            try:
+                property_id = db.add_property(123456, self.sample_property)
+                db.add_properties_mappings(123456, [self.sample_property])
+                
+                for prop in db.get_user_properties(123456):
+                    self.assertIsNotNone(prop.created_at)
+                    self.assertIsNotNone(prop.updated_at)
+                self.assertEqual(db.get_user_properties(123456)[-1].id, property_id)
+            finally:
+                db.close()
+    
+    def test_transaction_survives_other_calls(self):
+        """Calls that open their own session inside a transaction should not undo it"""
+        # A file database, since in-memory SQLite shares one connection between sessions
+        with tempfile.TemporaryDirectory() as directory:
+            db = DatabaseManager('sqlite:///' + os.path.join(directory, 'transaction.db'))
+            try:
+                with db.transaction() as session:
+                    property_id = db.add_property(123456, self.sample_property, session=session)
+                    db.get_statistics()
+                    db.get_user_properties(123456)
+                
+                self.assertIsNotNone(db.get_property(property_id))
+            finally:
+                db.close()
+    
+    def test_transaction_rollback(self):
+        """An error inside a transaction should undo all of its operations"""
+        with self.assertRaises(RuntimeError):
+            with self.db.transaction() as session:
+                self.db.add_property(123456, self.sample_property, session=session)
+                raise RuntimeError('abort')
+        
+        self.assertEqual(self.db.get_user_properties(123456), [])
+    
     def test_statistics(self):
         """get_statistics returns totals and averages"""
         self.db.add_property(123456, self.sample_property)
@@ -122,8 +298,15 @@ class TestDatabaseManager(unittest.TestCase):
         stats = self.db.get_statistics()
         
         self.assertEqual(stats['total_properties'], 2)
-        self.assertGreater(stats['average_price'], 0)
-        self.assertGreater(stats['average_area'], 0)
+        self.assertAlmostEqual(stats['average_price'], 4_000_000_000)
+        self.assertAlmostEqual(stats['average_area'], 100.25)
+    
+    def test_statistics_empty(self):
+        """get_statistics on an empty database returns zeros"""
+        self.assertEqual(
+            self.db.get_statistics(),
+            {'total_properties': 0, 'average_price': 0, 'average_area': 0}
+        )
     
     def test_property_to_dict(self):
         """Property.to_dict should return a dictionary"""
@@ -136,6 +319,15 @@ class TestDatabaseManager(unittest.TestCase):
         self.assertEqual(property_dict['title'], 'Sample Apartment')
         self.assertEqual(property_dict['city'], 'Tehran')
     
+    def test_search_properties_dicts(self):
+        """Dictionary search results should match Property.to_dict"""
+        property_id = self.db.add_property(123456, self.sample_property)
+        
+        results = self.db.search_properties_dicts({'city': 'Tehran'})
+        
+        self.assertEqual(results, [self.db.get_property(property_id).to_dict()])
+        self.assertEqual(self.db.search_properties_dicts({'city': 'Shiraz'}), [])
+    
     def test_property_to_text(self):
         """Property.to_text should return readable text"""
         property_id = self.db.add_property(123456, self.sample_property)
@@ -146,8 +338,12 @@ class TestDatabaseManager(unittest.TestCase):
         self.assertIsInstance(text, str)
         self.assertIn('Sample Apartment', text)
         self.assertIn('Tehran', text)
-
-
-if __name__ == '__main__':
-    unittest.main()
-
+    
+    def test_search_properties_text(self):
+        """Text search should render rows exactly like Property.to_text"""
+        property_id = self.db.add_property(123456, self.sample_property)
+        expected = self.db.get_property(property_id).to_text()
+        
+        self.assertEqual(self.db.search_properties_text({'city': 'Tehran'}), [(property_id, expected)])
+        self.assertEqual(self.db.search_properties_text({'city': 'Isfahan'}), [])
+        self.assertEqual(self.db.get_properties_text([property_id, 999]), [(property_id, expected)])
@@ -2,10 +2,6 @@
 Unit tests for utils.py helper functions.
 """
 import unittest
-import sys
-import os
-
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from utils import (
     format_price,
@@ -18,7 +14,8 @@ from utils import (
     format_phone_number,
     extract_property_type,
     calculate_price_per_meter,
-    sanitize_input
+    sanitize_input,
+    PropertyFilter
 )
 
 
@@ -50,6 +47,9 @@ class TestUtils(unittest.TestCase):
         text_persian = "قیمت ۵ میلیارد و متراژ ۱۲۰ متر"
         numbers_persian = extract_numbers(text_persian)
         self.assertEqual(len(numbers_persian), 2)
+        
+        # Persian decimal separator
+        self.assertEqual(extract_numbers("متراژ ۱۲۰٫۵ متر"), [120.5])
     
     def test_normalize_text(self):
         """Normalize whitespace and characters."""
@@ -100,8 +100,17 @@ class TestUtils(unittest.TestCase):
         dirty_input = "<script>alert('test')</script>Hello"
         clean = sanitize_input(dirty_input)
         self.assertNotIn("<script>", clean)
+        self.assertEqual(sanitize_input('<SCRIPT type="text/javascript">x</Script> Hi'), "x Hi")
 
-
-if __name__ == '__main__':
-    unittest.main()
-
+    def test_property_filter(self):
+        """Build filters, skipping missing values."""
+        filters = (
+            PropertyFilter()
+            .add_price_range(min_price=100, max_price=None)
+            .add_location(city='Tehran', neighborhood='')
+            .add_amenities(parking=False)
+            .get_filters()
+        )
+        self.assertEqual(dict(filters), {'min_price': 100, 'city': 'Tehran', 'parking': False})
+        with self.assertRaises(TypeError):
+            filters['rooms'] = 2
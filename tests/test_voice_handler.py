@@ -0,0 +1,58 @@
+"""
+Unit tests for voice_handler.py transcription retries.
+"""
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import openai
+
+from openai_session import close_session
+from voice_handler import VoiceHandler
+
+
+class TestVoiceHandler(unittest.IsolatedAsyncioTestCase):
+    """Tests for retrying transcription uploads."""
+
+    async def asyncSetUp(self):
+        self.handler = VoiceHandler()
+        self.handler.available = True
+        self.uploads = []
+
+    async def asyncTearDown(self):
+        await close_session()
+
+    async def _rate_limited_once(self, model, audio_file):
+        # Read and close the upload like a multipart sender would, failing the first call
+        self.uploads.append(audio_file.read())
+        if isinstance(audio_file, io.BufferedReader):
+            audio_file.close()
+        if len(self.uploads) == 1:
+            raise openai.error.RateLimitError("Rate limit reached", http_status=429)
+        return {"text": " hello "}
+
+    async def _transcribe(self, voice_file):
+        with mock.patch.object(openai.Audio, "atranscribe", side_effect=self._rate_limited_once), \
+                mock.patch("voice_handler.asyncio.sleep", new=mock.AsyncMock()):
+            return await self.handler.voice_to_text(voice_file)
+
+    async def test_path_retried_after_rate_limit(self):
+        """A path is reopened for the retry after a 429."""
+        with tempfile.NamedTemporaryFile(suffix=".ogg", delete=False) as audio:
+            audio.write(b"voice")
+        try:
+            text = await self._transcribe(audio.name)
+        finally:
+            os.remove(audio.name)
+        self.assertEqual(text, "hello")
+        self.assertEqual(self.uploads, [b"voice", b"voice"])
+
+    async def test_file_object_retried_after_rate_limit(self):
+        """A file object is rewound to its start for the retry after a 429."""
+        audio = io.BytesIO(b"voice")
+        audio.name = "voice.ogg"
+        text = await self._transcribe(audio)
+        self.assertEqual(text, "hello")
+        self.assertEqual(self.uploads, [b"voice", b"voice"])
@@ -3,10 +3,43 @@ Voice Message Handler for Real Estate Bot
 Performs speech-to-text conversion using OpenAI transcription models.
 """
 import asyncio
+import os
+import random
 
 import openai
 
 import config
+from openai_session import use_session
+
+
+# Transcription settings, read from config once at import
+_AVAILABLE = bool(config.OPENAI_API_KEY)
+_MODEL = getattr(config, "OPENAI_TRANSCRIPTION_MODEL", "whisper-1")
+
+# Errors worth retrying: rate limits, timeouts and transient server/network failures
+_RETRYABLE_ERRORS = (
+    openai.error.RateLimitError,
+    openai.error.Timeout,
+    openai.error.APIConnectionError,
+    openai.error.ServiceUnavailableError,
+    openai.error.TryAgain,
+)
+
+
+async def _call_with_backoff(coro_factory, max_attempts=3, base=0.5):
+    """
+    Await ``coro_factory()``, retrying retryable OpenAI errors with exponential backoff.
+
+    Waits ``base * 2**attempt`` seconds plus a little jitter between attempts and
+    re-raises the last error once ``max_attempts`` calls have failed.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return await coro_factory()
+        except _RETRYABLE_ERRORS:
+            if attempt == max_attempts - 1:
+                raise
+            await asyncio.sleep(base * 2 ** attempt + random.random() * 0.1)
 
 
 class VoiceHandler:
@@ -14,39 +47,67 @@ class VoiceHandler:
     Converts user voice messages to text using OpenAI APIs.
     """
 
+    available = _AVAILABLE
+    model = _MODEL
+
     def __init__(self):
-        self.available = bool(config.OPENAI_API_KEY)
         if self.available:
             openai.api_key = config.OPENAI_API_KEY
-            self.model = getattr(
-                config, "OPENAI_TRANSCRIPTION_MODEL", "whisper-1"
-            )
+        # Transcriptions are network-bound, so they run as concurrent async requests;
+        # the semaphore caps how many uploads are in flight at once
+        self._semaphore = asyncio.Semaphore(config.VOICE_MAX_CONCURRENCY)
 
-    async def voice_to_text(self, voice_file_path):
+    async def voice_to_text(self, voice_file):
         """
-        Convert an audio file path into transcribed text.
+        Convert audio into transcribed text.
+
+        Accepts a file path or a binary file-like object with a ``name``
+        attribute carrying the audio extension (e.g. ``voice.ogg``).
         """
         if not self.available:
             return None
 
-        loop = asyncio.get_running_loop()
         try:
-            return await loop.run_in_executor(
-                None, self._transcribe_file, voice_file_path
-            )
+            async with self._semaphore:
+                return await self._transcribe_file(voice_file)
         except Exception as exc:
             print(f"Error converting voice to text with OpenAI: {exc}")
             return None
 
-    def _transcribe_file(self, voice_file_path):
-        with open(voice_file_path, "rb") as audio_file:
-            result = openai.Audio.transcribe(self.model, audio_file)
-            if isinstance(result, dict):
-                return result.get("text", "").strip()
-            if hasattr(result, "text"):
-                return result.text.strip()
-            return None
+    async def voice_to_text_batch(self, voice_files):
+        """
+        Transcribe several audio files concurrently.
+
+        Returns the texts in the order of ``voice_files`` (None for failures);
+        at most VOICE_MAX_CONCURRENCY uploads run at the same time.
+        """
+        return await asyncio.gather(*(self.voice_to_text(voice_file) for voice_file in voice_files))
+
+    async def _transcribe_file(self, voice_file):
+        use_session()
+        if isinstance(voice_file, (str, os.PathLike)):
+            # Reopen the file for every attempt, so a retry never reuses a consumed handle
+            result = await _call_with_backoff(lambda: self._transcribe_path(voice_file))
+        else:
+            # Every attempt uploads the audio again from where it started
+            start = voice_file.tell()
+
+            def request():
+                voice_file.seek(start)
+                return openai.Audio.atranscribe(self.model, voice_file)
+
+            result = await _call_with_backoff(request)
+
+        if isinstance(result, dict):
+            return result.get("text", "").strip()
+        if hasattr(result, "text"):
+            return result.text.strip()
+        return None
+
+    async def _transcribe_path(self, path):
+        with open(path, "rb") as audio_file:
+            return await openai.Audio.atranscribe(self.model, audio_file)
 
     def is_available(self):
         """Return True if transcription service is configured."""
-        return self.available
+        return _AVAILABLE